@@ -0,0 +1,58 @@
+import json
+
+from django.core.management import BaseCommand
+
+from api.metrics import collect, render_prometheus
+from api.v1.cache import get_stats
+
+TABLE_COLUMNS = (
+    ('request_duration_seconds', 'мс'),
+    ('db_duration_seconds', 'мс БД'),
+    ('serializer_duration_seconds', 'мс сер.'),
+    ('db_queries', 'запросов'),
+)
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Выводит метрики запросов по маршрутам всех процессов и счётчики '
+        'кэша ответов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=('table', 'json', 'prometheus'),
+            default='table',
+            help='Формат вывода',
+        )
+
+    def handle(self, *args, **options):
+        routes = collect()
+        if options['format'] == 'json':
+            self.stdout.write(json.dumps(routes, indent=2, sort_keys=True))
+            return
+        if options['format'] == 'prometheus':
+            self.stdout.write(
+                render_prometheus(routes, get_stats()), ending=''
+            )
+            return
+        self.stdout.write(f'{"маршрут":<32}{"запросы":>10}' + ''.join(
+            f'{title:>12}' for _, title in TABLE_COLUMNS
+        ))
+        for route in sorted(routes):
+            histograms = routes[route]
+            count = histograms['request_duration_seconds']['count']
+            averages = []
+            for name, _ in TABLE_COLUMNS:
+                average = histograms[name]['sum'] / count
+                if name.endswith('_seconds'):
+                    average *= 1000
+                averages.append(f'{average:>12.2f}')
+            self.stdout.write(f'{route:<32}{count:>10}' + ''.join(averages))
+        stats = get_stats()
+        self.stdout.write(
+            f'Кэш ответов: попаданий {stats["hits"]}, '
+            f'промахов {stats["misses"]}'
+        )
@@ -0,0 +1,204 @@
+import copy
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, HttpResponse
+
+from api.v1.cache import get_stats
+from core.constants import METRICS_DURATION_BUCKETS, METRICS_QUERY_BUCKETS
+
+PROMETHEUS_PREFIX = 'api_'
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Метрика: описание и границы корзин гистограммы.
+METRICS = {
+    'request_duration_seconds': (
+        'Время обработки запроса', METRICS_DURATION_BUCKETS
+    ),
+    'db_duration_seconds': (
+        'Суммарное время SQL запросов', METRICS_DURATION_BUCKETS
+    ),
+    'serializer_duration_seconds': (
+        'Время сериализации ответа', METRICS_DURATION_BUCKETS
+    ),
+    'db_queries': ('Количество SQL запросов', METRICS_QUERY_BUCKETS),
+}
+# Счётчики кэша ответов (api.v1.cache): ключ get_stats() и описание.
+CACHE_COUNTERS = {
+    'hits': 'Ответы из кэша ответов анонимным',
+    'misses': 'Промахи кэша ответов анонимным',
+}
+
+
+def empty_histogram(buckets):
+    # Последняя корзина — значения больше всех границ (+Inf).
+    return {'buckets': [0] * (len(buckets) + 1), 'sum': 0, 'count': 0}
+
+
+def merge(target, source):
+    """Добавляет гистограммы маршрутов source к target."""
+    for route, histograms in source.items():
+        route_histograms = target.setdefault(route, {})
+        for name, histogram in histograms.items():
+            if name not in route_histograms:
+                route_histograms[name] = copy.deepcopy(histogram)
+                continue
+            total = route_histograms[name]
+            total['buckets'] = [
+                left + right for left, right in zip(
+                    total['buckets'], histogram['buckets']
+                )
+            ]
+            total['sum'] += histogram['sum']
+            total['count'] += histogram['count']
+    return target
+
+
+class Registry:
+    """
+    Гистограммы метрик по маршрутам в памяти процесса.
+
+    Каждый процесс периодически сохраняет свои гистограммы в файл
+    METRICS_DIR/<pid>.json, а выгрузка складывает файлы всех процессов.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+        self.flushed_at = 0
+
+    def observe(self, route, values):
+        with self.lock:
+            histograms = self.routes.setdefault(route, {})
+            for name, value in values.items():
+                buckets = METRICS[name][1]
+                histogram = histograms.setdefault(
+                    name, empty_histogram(buckets)
+                )
+                histogram['buckets'][bisect_left(buckets, value)] += 1
+                histogram['sum'] += value
+                histogram['count'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            return copy.deepcopy(self.routes)
+
+    def clear(self):
+        with self.lock:
+            self.routes = {}
+
+    def flush(self, force=False):
+        """Сохраняет гистограммы процесса не чаще METRICS_FLUSH_INTERVAL."""
+        now = time.monotonic()
+        if not force and now - self.flushed_at < (
+            settings.METRICS_FLUSH_INTERVAL
+        ):
+            return
+        self.flushed_at = now
+        os.makedirs(settings.METRICS_DIR, exist_ok=True)
+        path = os.path.join(settings.METRICS_DIR, f'{os.getpid()}.json')
+        with open(f'{path}.tmp', 'w', encoding='utf-8') as file:
+            json.dump(self.snapshot(), file)
+        os.replace(f'{path}.tmp', path)
+
+
+registry = Registry()
+
+
+def is_running(pid):
+    """Существует ли процесс pid на этой машине (только для POSIX)."""
+    if os.name != 'posix':
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def collect():
+    """
+    Гистограммы работающих процессов, сохранивших метрики.
+
+    Файлы завершившихся процессов удаляются: иначе их значения
+    учитывались бы после каждого перезапуска. Для Prometheus это выглядит
+    как сброс счётчиков.
+    """
+    if registry.routes:
+        registry.flush(force=True)
+    routes = {}
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+        pid = os.path.splitext(os.path.basename(path))[0]
+        if pid.isdigit() and not is_running(int(pid)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            continue
+        with open(path, encoding='utf-8') as file:
+            merge(routes, json.load(file))
+    return routes
+
+
+def format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(routes, cache_stats=None):
+    """Гистограммы и счётчики кэша ответов в формате Prometheus."""
+    lines = []
+    for outcome, description in CACHE_COUNTERS.items():
+        if cache_stats is not None:
+            metric = f'{PROMETHEUS_PREFIX}response_cache_{outcome}_total'
+            lines.append(f'# HELP {metric} {description}')
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {cache_stats[outcome]}')
+    for name, (description, buckets) in METRICS.items():
+        metric = f'{PROMETHEUS_PREFIX}{name}'
+        lines.append(f'# HELP {metric} {description}')
+        lines.append(f'# TYPE {metric} histogram')
+        for route in sorted(routes):
+            histogram = routes[route].get(name)
+            if histogram is None:
+                continue
+            cumulative = 0
+            bounds = [format_value(bound) for bound in buckets] + ['+Inf']
+            for bound, count in zip(bounds, histogram['buckets']):
+                cumulative += count
+                lines.append(
+                    f'{metric}_bucket{{route="{route}",le="{bound}"}} '
+                    f'{cumulative}'
+                )
+            lines.append(
+                f'{metric}_sum{{route="{route}"}} '
+                f'{format_value(histogram["sum"])}'
+            )
+            lines.append(
+                f'{metric}_count{{route="{route}"}} {histogram["count"]}'
+            )
+    return '\n'.join(lines) + '\n'
+
+
+def prometheus_view(request):
+    """
+    Метрики для Prometheus, если включено их сохранение.
+
+    Гистограммы раскрывают маршруты и нагрузку, поэтому отдаются только
+    на адреса из METRICS_ALLOWED_IPS.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404
+    if request.META.get('REMOTE_ADDR') not in settings.METRICS_ALLOWED_IPS:
+        raise PermissionDenied
+    return HttpResponse(
+        render_prometheus(collect(), get_stats()),
+        content_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -0,0 +1,117 @@
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+from rest_framework.serializers import ListSerializer, Serializer
+
+from api.metrics import registry
+
+UNMATCHED_ROUTE = 'unmatched'
+
+current_timings = ContextVar('current_timings', default=None)
+
+
+class RequestTimings:
+    """Счётчики одного запроса."""
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0
+        self.serializer = 0
+        self.serializing = False
+
+    def execute(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - start
+            self.queries += 1
+
+
+@contextmanager
+def timed_queries(timings):
+    """Учитывает в timings запросы соединений текущего потока."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timings.execute))
+        yield
+
+
+def timed_data(data):
+    """Свойство `data` сериализатора с замером времени внешнего вызова."""
+
+    def get_data(serializer):
+        timings = current_timings.get()
+        if timings is None or timings.serializing:
+            return data.fget(serializer)
+        timings.serializing = True
+        start = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            timings.serializing = False
+            timings.serializer += time.perf_counter() - start
+
+    get_data.timed = True
+    return property(get_data, doc=data.__doc__)
+
+
+def install_serializer_timing():
+    """Подменяет `data` сериализаторов DRF, через который идёт сериализация."""
+    for serializer_class in (Serializer, ListSerializer):
+        if not getattr(serializer_class.data.fget, 'timed', False):
+            serializer_class.data = timed_data(serializer_class.data)
+
+
+def get_route(request):
+    """Имя маршрута: для API — имя из router_v1 (`titles-list`)."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    if match.app_name == 'api':
+        return match.url_name
+    return match.view_name
+
+
+class MetricsMiddleware:
+    """
+    Замеряет количество и время SQL запросов, время сериализации и общее
+    время обработки запроса.
+
+    Значения отдаются в заголовке Server-Timing и накапливаются в
+    гистограммах по маршрутам (api.metrics). Для потоковых ответов
+    учитывается только время до начала передачи тела. Запросы
+    представлений, выполняемых в других потоках, учитываются там же через
+    timed_queries и current_timings (см. api.v1.async_reads).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        install_serializer_timing()
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        start = time.perf_counter()
+        try:
+            with timed_queries(timings):
+                response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        total = time.perf_counter() - start
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timings.db * 1000:.2f};'
+            f'desc="{timings.queries} queries"',
+            f'serializer;dur={timings.serializer * 1000:.2f}',
+            f'total;dur={total * 1000:.2f}',
+        ))
+        registry.observe(get_route(request), {
+            'request_duration_seconds': total,
+            'db_duration_seconds': timings.db,
+            'serializer_duration_seconds': timings.serializer,
+            'db_queries': timings.queries,
+        })
+        registry.flush()
+        return response
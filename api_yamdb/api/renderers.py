@@ -0,0 +1,58 @@
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Готовые фрагменты JSON вставляются в ответ только через orjson.Fragment
+# (orjson 3.9+): разбор фрагментов в Python обошёлся бы дороже, чем
+# повторное кодирование небольших словарей.
+FRAGMENTS_SUPPORTED = hasattr(orjson, 'Fragment')
+
+_encoder = JSONEncoder()
+# Даты и датаклассы кодируются энкодером DRF: у orjson свой формат.
+OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+) if orjson else 0
+
+
+def json_fragment(value):
+    """Закодированное значение для вставки в ответ FastJSONRenderer."""
+    return orjson.Fragment(
+        orjson.dumps(value, default=_encoder.default, option=OPTIONS)
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер на orjson.
+
+    Ответ совпадает с JSONRenderer DRF: компактный, без экранирования
+    не-ASCII символов, с экранированием U+2028 и U+2029; даты и типы,
+    которые orjson не знает, кодируются энкодером DRF. Без orjson, при
+    запросе отступов или с настройками UNICODE_JSON=False и
+    COMPACT_JSON=False работает как JSONRenderer.
+    """
+
+    supports_fragments = FRAGMENTS_SUPPORTED
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(
+                data, accepted_media_type, renderer_context
+            )
+        ret = orjson.dumps(data, default=_encoder.default, option=OPTIONS)
+        # Как и JSONRenderer: разделители строк недопустимы в JavaScript.
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace('\u2029'.encode(), b'\\u2029')
@@ -0,0 +1,71 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from api.middleware import current_timings, timed_queries
+
+READ_METHODS = ('GET', 'HEAD')
+
+_executor = None
+
+
+def get_executor():
+    """Общий пул потоков для чтения, создаётся при первом запросе."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.ASYNC_READ_WORKERS,
+            thread_name_prefix='async-read',
+        )
+    return _executor
+
+
+def run_read(view, request, args, kwargs):
+    """
+    Обрабатывает и рендерит запрос в потоке пула.
+
+    У потока пула свои соединения с БД, поэтому запросы для метрик
+    (MetricsMiddleware) замеряются здесь в счётчиках из контекста.
+    """
+    close_old_connections()
+    timings = current_timings.get()
+    try:
+        with timed_queries(timings) if timings else nullcontext():
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(view):
+    """
+    Асинхронная обёртка представления для ASGI.
+
+    Под ASGI синхронные представления Django выполняет по одному в общем
+    потоке (thread_sensitive). GET и HEAD здесь выполняются вместе с
+    запросами к БД и сериализацией в пуле из ASYNC_READ_WORKERS потоков,
+    не блокируя цикл событий; сверх этого числа запросы ждут в очереди
+    пула. Остальные методы выполняются как обычные синхронные
+    представления.
+    """
+    sync_view = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in READ_METHODS:
+            return await sync_view(request, *args, **kwargs)
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            get_executor(),
+            partial(context.run, run_read, view, request, args, kwargs),
+        )
+
+    return wrapper
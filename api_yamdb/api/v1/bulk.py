@@ -0,0 +1,173 @@
+from django.db import transaction
+from django.utils.encoding import force_str
+from rest_framework.fields import Field
+from rest_framework.relations import SlugRelatedField
+
+from api.v1.serializers import TitleBulkItemSerializer
+from core.constants import (
+    TITLE_NOT_FOUND_MESSAGE,
+    TITLE_REPEATED_MESSAGE,
+    TITLES_BULK_BATCH_SIZE
+)
+from reviews import lookups
+from reviews.models import ResourceVersion, Title
+
+TitleGenre = Title.genre.through
+RELATION_FIELDS = ('id', 'genre')
+
+
+def does_not_exist(value):
+    return force_str(
+        SlugRelatedField.default_error_messages['does_not_exist']
+    ).format(slug_name='slug', value=value)
+
+
+def set_bulk_created_pks(model, objects):
+    """
+    Проставляет ключи объектам после bulk_create, если БД их не вернула.
+
+    Django 3.2 получает ключи из bulk_create только в PostgreSQL. В SQLite
+    после вставки транзакция держит блокировку записи, а rowid выдаются
+    подряд, поэтому вставленные строки — последние len(objects) ключей.
+    """
+    if not objects or objects[0].pk is not None:
+        return
+    pks = model.objects.order_by('-pk').values_list('pk', flat=True)
+    for instance, pk in zip(objects, reversed(list(pks[:len(objects)]))):
+        instance.pk = pk
+
+
+class TitleBulkWriter:
+    """
+    Массовое создание (partial=False) или изменение произведений.
+
+    Категории и жанры ищутся в таблицах в памяти процесса
+    (reviews.lookups), произведения и связи с жанрами записываются
+    пачками. Произведения с ошибками пропускаются, остальные сохраняются.
+    """
+
+    def __init__(self, items, partial=False):
+        self.items = items
+        self.partial = partial
+        self.results = [None] * len(items)
+        self.valid = {}
+
+    def add_error(self, index, field, message):
+        self.valid.pop(index, None)
+        self.results[index] = {'errors': {field: [message]}}
+
+    def validate(self):
+        for index, item in enumerate(self.items):
+            serializer = TitleBulkItemSerializer(
+                data=item, partial=self.partial
+            )
+            if not serializer.is_valid():
+                self.results[index] = {'errors': serializer.errors}
+                continue
+            data = dict(serializer.validated_data)
+            if not self.partial:
+                data.pop('id', None)
+            self.valid[index] = data
+            if self.partial and 'id' not in data:
+                self.add_error(
+                    index, 'id', force_str(
+                        Field.default_error_messages['required']
+                    )
+                )
+
+    def resolve(self):
+        """Заменяет слаги категорий и жанров объектами."""
+        categories = lookups.categories.slugs({
+            data['category'] for data in self.valid.values()
+            if 'category' in data
+        })
+        genres = lookups.genres.slugs({
+            slug for data in self.valid.values()
+            for slug in data.get('genre', ())
+        })
+        for index, data in list(self.valid.items()):
+            if 'category' in data:
+                if data['category'] not in categories:
+                    self.add_error(
+                        index, 'category', does_not_exist(data['category'])
+                    )
+                    continue
+                data['category'] = categories[data['category']]
+            if 'genre' in data:
+                missing = [
+                    slug for slug in data['genre'] if slug not in genres
+                ]
+                if missing:
+                    self.add_error(index, 'genre', does_not_exist(missing[0]))
+                    continue
+                data['genre'] = [
+                    genres[slug] for slug in dict.fromkeys(data['genre'])
+                ]
+
+    def save(self):
+        """Сохраняет корректные произведения и возвращает итог по каждому."""
+        self.validate()
+        self.resolve()
+        with transaction.atomic():
+            if self.partial:
+                titles = self.update()
+            else:
+                titles = self.create()
+            TitleGenre.objects.bulk_create(
+                (
+                    TitleGenre(title_id=title.pk, genre_id=genre.pk)
+                    for index, title in titles.items()
+                    for genre in self.valid[index].get('genre', ())
+                ),
+                batch_size=TITLES_BULK_BATCH_SIZE,
+            )
+            if titles:
+                ResourceVersion.bump('titles')
+        for index, title in titles.items():
+            self.results[index] = {'id': title.pk}
+        return self.results
+
+    def get_fields(self, data):
+        return {
+            field: value for field, value in data.items()
+            if field not in RELATION_FIELDS
+        }
+
+    def create(self):
+        titles = {
+            index: Title(**self.get_fields(data))
+            for index, data in self.valid.items()
+        }
+        objects = list(titles.values())
+        Title.objects.bulk_create(objects, batch_size=TITLES_BULK_BATCH_SIZE)
+        set_bulk_created_pks(Title, objects)
+        return titles
+
+    def update(self):
+        existing = Title.objects.in_bulk(
+            [data['id'] for data in self.valid.values()]
+        )
+        titles = {}
+        fields = set()
+        seen = set()
+        for index, data in list(self.valid.items()):
+            if data['id'] not in existing:
+                self.add_error(index, 'id', TITLE_NOT_FOUND_MESSAGE)
+                continue
+            if data['id'] in seen:
+                self.add_error(index, 'id', TITLE_REPEATED_MESSAGE)
+                continue
+            seen.add(data['id'])
+            title = titles[index] = existing[data['id']]
+            for field, value in self.get_fields(data).items():
+                setattr(title, field, value)
+                fields.add(field)
+        if fields:
+            Title.objects.bulk_update(
+                titles.values(), fields, batch_size=TITLES_BULK_BATCH_SIZE
+            )
+        TitleGenre.objects.filter(title_id__in=[
+            title.pk for index, title in titles.items()
+            if 'genre' in self.valid[index]
+        ]).delete()
+        return titles
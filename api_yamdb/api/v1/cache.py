@@ -0,0 +1,93 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from rest_framework import status
+
+CACHE_KEY = 'responses:{resource}:{generation}:{format}:{digest}'
+COUNTER_KEY = 'responses:{}'
+HIT = 'hits'
+MISS = 'misses'
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def normalize_query(query_params):
+    """Строка запроса без пустых параметров, отсортированная по ключам."""
+    return urlencode(sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    ))
+
+
+def get_cache_key(request, version):
+    """
+    Ключ ответа: ресурс, поколение данных, формат, адрес и запрос.
+
+    Поколение меняется при каждом изменении ресурса, поэтому старые
+    ответы не удаляются, а перестают находиться и истекают по таймауту.
+    Ссылки пагинации в ответе абсолютные, а вывод зависит от параметров
+    типа (например, indent), поэтому в ключ входят схема и хост запроса
+    и полный принятый тип.
+    """
+    location = '{} {}?{}'.format(
+        request.accepted_media_type,
+        request.build_absolute_uri(request.path),
+        normalize_query(request.query_params),
+    )
+    return CACHE_KEY.format(
+        resource=version.name,
+        generation=f'{version.version}.{version.updated_at.timestamp()}',
+        format=request.accepted_renderer.format,
+        digest=hashlib.md5(location.encode()).hexdigest(),
+    )
+
+
+def count(outcome):
+    """Увеличивает счётчик попаданий или промахов кэша."""
+    cache = get_response_cache()
+    key = COUNTER_KEY.format(outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    """Счётчики попаданий и промахов кэша ответов."""
+    counters = get_response_cache().get_many(
+        [COUNTER_KEY.format(outcome) for outcome in (HIT, MISS)]
+    )
+    return {
+        outcome: counters.get(COUNTER_KEY.format(outcome), 0)
+        for outcome in (HIT, MISS)
+    }
+
+
+def get_cached_response(key):
+    cached = get_response_cache().get(key)
+    count(MISS if cached is None else HIT)
+    if cached is None:
+        return None
+    content, content_type = cached
+    return HttpResponse(content, content_type=content_type)
+
+
+def cache_response(key, response):
+    """Сохраняет успешный ответ в кэш после рендеринга."""
+    if response.status_code != status.HTTP_200_OK:
+        return
+
+    def store(rendered):
+        get_response_cache().set(
+            key, (rendered.content, rendered['Content-Type'])
+        )
+
+    response.add_post_render_callback(store)
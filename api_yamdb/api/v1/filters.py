@@ -1,17 +1,34 @@
 from django_filters import rest_framework as filters
+from rest_framework.filters import BaseFilterBackend
 
-from reviews.models import Title
+from reviews.models import Category, Title
+from reviews.search import search_titles
+
+TitleGenre = Title.genre.through
+
+
+class SlugListFilter(filters.BaseInFilter, filters.CharFilter):
+    """Один или несколько слагов через запятую."""
 
 
 class TitleFilter(filters.FilterSet):
-    category = filters.CharFilter(
+    """
+    Фильтры произведений.
+
+    `category` и `genre` сравнивают слаги точно и принимают список через
+    запятую: категории и жанры отбираются подзапросами IN по индексам
+    слагов и связей, без JOIN в основном запросе и без повторов строк.
+    Поиск подстроки в слаге — параметры `category__icontains` и
+    `genre__icontains`.
+    """
+
+    category = SlugListFilter(method='filter_category')
+    genre = SlugListFilter(method='filter_genre')
+    category__icontains = filters.CharFilter(
         field_name='category__slug',
         lookup_expr='icontains'
     )
-    genre = filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='icontains'
-    )
+    genre__icontains = filters.CharFilter(method='filter_genre')
     name = filters.CharFilter(
         field_name='name',
         lookup_expr='icontains'
@@ -22,6 +39,34 @@ class TitleFilter(filters.FilterSet):
         fields = [
             'category',
             'genre',
+            'category__icontains',
+            'genre__icontains',
             'name',
             'year'
         ]
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category_id__in=Category.objects.filter(
+            slug__in=value
+        ).values('id'))
+
+    def filter_genre(self, queryset, name, value):
+        if name == 'genre__icontains':
+            genres = {'genre__slug__icontains': value}
+        else:
+            genres = {'genre__slug__in': value}
+        return queryset.filter(id__in=TitleGenre.objects.filter(
+            **genres
+        ).values('title_id'))
+
+
+class TitleSearchFilter(BaseFilterBackend):
+    """Полнотекстовый поиск произведений с сортировкой по релевантности."""
+
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_titles(queryset, query)
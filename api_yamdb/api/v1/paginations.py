@@ -0,0 +1,168 @@
+import base64
+import binascii
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset).
+
+    Курсор хранит значения полей сортировки крайнего объекта страницы,
+    поэтому следующая страница выбирается по индексу без OFFSET и COUNT(*).
+    """
+
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    invalid_cursor_message = 'Неверный курсор.'
+
+    def __init__(self, ordering, page_size):
+        self.ordering = tuple(
+            (field.lstrip('-'), field.startswith('-')) for field in ordering
+        )
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(
+            request.build_absolute_uri(), self.page_query_param
+        )
+        self.model = queryset.model
+        position, self.reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(
+                (field, not descending) for field, descending in ordering
+            )
+        queryset = queryset.order_by(*(
+            f'-{field}' if descending else field
+            for field, descending in ordering
+        ))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(ordering, position)
+            )
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict((
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        )))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    @staticmethod
+    def get_keyset_filter(ordering, position):
+        """
+        Условие «строго после позиции» для составного ключа.
+
+        Нестрогая граница по первому полю позволяет БД начать поиск по
+        индексу сразу с нужной позиции.
+        """
+        keyset_filter = Q()
+        equal = {}
+        for (field, descending), value in zip(ordering, position):
+            lookup = 'lt' if descending else 'gt'
+            keyset_filter |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        (field, descending), value = ordering[0], position[0]
+        lookup = 'lte' if descending else 'gte'
+        return Q(**{f'{field}__{lookup}': value}) & keyset_filter
+
+    def get_position(self, instance):
+        attnames = [
+            self.model._meta.get_field(field).attname
+            for field, _ in self.ordering
+        ]
+        # Строки `.values()` вместо объектов модели.
+        if isinstance(instance, dict):
+            return [instance[attname] for attname in attnames]
+        return [getattr(instance, attname) for attname in attnames]
+
+    def encode_cursor(self, instance, reverse):
+        cursor = json.dumps(
+            {'p': self.get_position(instance), 'r': int(reverse)},
+            default=str,
+        )
+        encoded = base64.urlsafe_b64encode(cursor.encode()).decode()
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded
+        )
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values = cursor['p']
+            if len(values) != len(self.ordering):
+                raise ValueError
+            position = [
+                self.model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(self.ordering, values)
+            ]
+            return position, bool(cursor.get('r'))
+        except (
+            binascii.Error, KeyError, TypeError, ValueError, ValidationError
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class KeysetOptInPagination(PageNumberPagination):
+    """
+    Постраничная пагинация с переключением на keyset-режим.
+
+    Keyset-режим включается параметром `cursor` (пустое значение — первая
+    страница) и сортирует выдачу по `keyset_ordering`.
+    """
+
+    keyset_ordering = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if KeysetPagination.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination(
+                self.keyset_ordering, self.get_page_size(request)
+            )
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class TitlePagination(KeysetOptInPagination):
+    keyset_ordering = ('-year', 'id')
+
+
+class PublicationPagination(KeysetOptInPagination):
+    keyset_ordering = ('-pub_date', 'id')
@@ -1,4 +1,9 @@
+from functools import lru_cache
+from operator import itemgetter
+
 from django.contrib.auth.tokens import default_token_generator
+from django.db import transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.generics import get_object_or_404
 from rest_framework.serializers import (
@@ -8,7 +13,9 @@ from rest_framework.serializers import (
     ValidationError
 )
 
+from api.renderers import json_fragment
 from core.constants import (
+    JSON_FRAGMENT_CACHE_SIZE,
     MAX_LENGTH_EMAIL,
     MAX_LENGTH_USERNAME,
     RATING_DEFAULT_VALUE
@@ -18,6 +25,7 @@ from core.validators import (
     UsernameRegexValidator,
     username_validator
 )
+from reviews import lookups
 from reviews.models import (
     Category,
     Comment,
@@ -51,6 +59,7 @@ class UserCreateSerializer(ModelSerializer):
             'email'
         )
 
+    @transaction.atomic
     def create(self, validated_data):
         user, _ = User.objects.get_or_create(**validated_data)
         confirmation_code = default_token_generator.make_token(user)
@@ -142,20 +151,6 @@ class ReviewSerializer(ModelSerializer):
         model = Review
         exclude = ('title',)
 
-    def validate(self, data):
-        request = self.context.get('request')
-        if request.method != 'POST':
-            return data
-        view = self.context.get('view')
-        title = get_object_or_404(
-            Title, pk=view.kwargs.get('title_id')
-        )
-        if title.reviews.filter(author=request.user).exists():
-            raise ValidationError(
-                'Можно оставить только один отзыв для одного произведения!'
-            )
-        return data
-
 
 class CommentSerializer(ModelSerializer):
     """Сериализатор комментария."""
@@ -182,18 +177,34 @@ class TitleReadSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('rating_sum', 'rating_count')
         model = Title
 
 
+class LookupSlugRelatedField(SlugRelatedField):
+    """Объект по слагу из таблицы в памяти процесса (reviews.lookups)."""
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup
+        kwargs.setdefault('queryset', lookup.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        slug = smart_str(data)
+        try:
+            return self.lookup.slugs([slug])[slug]
+        except KeyError:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+
+
 class TitleWriteSerializer(serializers.ModelSerializer):
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
-    )
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        slug_field='slug',
+    category = LookupSlugRelatedField(lookups.categories)
+    genre = LookupSlugRelatedField(
+        lookups.genres,
         many=True,
         allow_empty=False,
     )
@@ -204,3 +215,165 @@ class TitleWriteSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return TitleReadSerializer(instance).data
+
+
+class TitleBulkItemSerializer(ModelSerializer):
+    """
+    Проверка одного произведения массовой загрузки без запросов к БД.
+
+    Слаги категории и жанров проверяются только по формату, объекты
+    ищутся сразу для всех произведений запроса.
+    """
+
+    id = serializers.IntegerField(required=False)
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        allow_empty=False,
+    )
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'description', 'category', 'genre')
+        model = Title
+
+
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Сериализатор строк `.values()` для чтения списков.
+
+    Словари ответа собираются напрямую, без полей DRF на каждый объект.
+    Порядок ключей и формат значений повторяют обычный сериализатор, и
+    JSON ответа совпадает с ним побайтно.
+    """
+
+    columns = ()
+
+    @classmethod
+    def values(cls, queryset):
+        """Запрос строк, которые принимает сериализатор."""
+        return queryset.prefetch_related(None).values(*cls.columns)
+
+
+@lru_cache(maxsize=JSON_FRAGMENT_CACHE_SIZE)
+def slug_name_fragment(slug, name):
+    """Категория или жанр в формате CategorySerializer/GenreSerializer."""
+    return json_fragment({'slug': slug, 'name': name})
+
+
+@lru_cache(maxsize=JSON_FRAGMENT_CACHE_SIZE)
+def genres_fragment(genres):
+    """Список жанров произведения из пар (slug, name)."""
+    return json_fragment([
+        {'slug': slug, 'name': name} for slug, name in genres
+    ])
+
+
+class TitleValuesListSerializer(serializers.ListSerializer):
+    """
+    Жанры страницы произведений загружаются одним запросом.
+
+    Если рендерер ответа принимает готовые фрагменты JSON
+    (api.renderers.FastJSONRenderer с orjson.Fragment), категория и
+    список жанров кодируются один раз на процесс, а не для каждой строки.
+    """
+
+    def use_fragments(self):
+        request = self.context.get('request')
+        renderer = getattr(request, 'accepted_renderer', None)
+        return getattr(renderer, 'supports_fragments', False)
+
+    def to_representation(self, data):
+        rows = list(data)
+        if not rows:
+            return []
+        genre_ids = {row['id']: [] for row in rows}
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=genre_ids
+        ).values_list('title_id', 'genre_id'):
+            genre_ids[title_id].append(genre_id)
+        categories = lookups.categories.ids(
+            {row['category_id'] for row in rows}
+        )
+        genres = lookups.genres.ids(
+            {pk for pks in genre_ids.values() for pk in pks}
+        )
+        use_fragments = self.use_fragments()
+        for row in rows:
+            category = categories[row['category_id']]
+            category = (category.slug, category.name)
+            title_genres = tuple(sorted(
+                ((genres[pk].slug, genres[pk].name)
+                 for pk in genre_ids[row['id']]),
+                key=itemgetter(1),
+            ))
+            if use_fragments:
+                row['category'] = slug_name_fragment(*category)
+                row['genre'] = genres_fragment(title_genres)
+                continue
+            row['category'] = {'slug': category[0], 'name': category[1]}
+            row['genre'] = [
+                {'slug': slug, 'name': name} for slug, name in title_genres
+            ]
+        return super().to_representation(rows)
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """Произведение в формате TitleReadSerializer."""
+
+    columns = (
+        'id',
+        'category_id',
+        'rating_sum',
+        'rating_count',
+        'name',
+        'year',
+        'description',
+    )
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        kwargs['child'] = cls()
+        return TitleValuesListSerializer(*args, **kwargs)
+
+    def to_representation(self, row):
+        count = row['rating_count']
+        return {
+            'id': row['id'],
+            'category': row['category'],
+            'genre': row['genre'],
+            'rating': int(row['rating_sum'] / count) if count else None,
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+        }
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Отзыв в формате ReviewSerializer."""
+
+    columns = ('id', 'author__username', 'text', 'pub_date', 'score')
+    pub_date = serializers.DateTimeField()
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'text': row['text'],
+            'pub_date': self.pub_date.to_representation(row['pub_date']),
+            'score': row['score'],
+        }
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Комментарий в формате CommentSerializer."""
+
+    columns = ('id', 'author__username', 'text', 'pub_date')
+    pub_date = serializers.DateTimeField()
+
+    def to_representation(self, row):
+        return {
+            'id': row['id'],
+            'author': row['author__username'],
+            'text': row['text'],
+            'pub_date': self.pub_date.to_representation(row['pub_date']),
+        }
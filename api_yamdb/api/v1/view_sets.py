@@ -1,9 +1,192 @@
-from rest_framework import filters, mixins, viewsets
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import filters, mixins, permissions, status, viewsets
 
+from core.db.routers import (
+    choose_replica,
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_database
+)
+from reviews.models import ResourceVersion
+from .async_reads import async_read_view
+from .cache import cache_response, get_cache_key, get_cached_response
 from .permissions import IsAdminUserOrReadOnly
 
 
+class ConditionalGetMixin:
+    """
+    Условные GET-запросы (ETag/Last-Modified).
+
+    Валидаторы строятся по счётчику изменений ресурса `version_resource`,
+    поэтому ответ 304 отдаётся без основного запроса и сериализации.
+    Для одного объекта ETag включает его ключ, а 304 отдаётся только
+    после проверки, что объект существует: иначе валидатор одного
+    объекта подходил бы к несуществующему. Ответы анонимным
+    пользователям кэшируются по тому же счётчику.
+    """
+
+    version_resource = None
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        # Версия читается до данных: запись между ними даст клиенту
+        # более новые данные со старым ETag, но не наоборот.
+        version = ResourceVersion.current(self.version_resource)
+        lookup = kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        parts = [version.name, version.version]
+        if self.detail:
+            parts.append(lookup)
+        parts.append(request.accepted_renderer.format)
+        etag = '"{}"'.format('-'.join(map(str, parts)))
+        last_modified = (
+            int(version.updated_at.timestamp())
+            if version.updated_at else None
+        )
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if (
+            response is not None
+            and self.detail
+            and not self.object_exists(lookup)
+        ):
+            response = None
+        if response is None:
+            response = self.cached_response(
+                version, handler, request, *args, **kwargs
+            )
+        if response.status_code in (
+            status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED
+        ):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def object_exists(self, lookup):
+        return self.get_queryset().filter(
+            **{self.lookup_field: lookup}
+        ).exists()
+
+    def cached_response(self, version, handler, request, *args, **kwargs):
+        # Без записи о версии поколение данных неизвестно, а страницы
+        # Browsable API содержат CSRF-токен.
+        if (
+            version.updated_at is None
+            or not request.user.is_anonymous
+            or request.accepted_renderer.format == 'api'
+        ):
+            return handler(request, *args, **kwargs)
+        key = get_cache_key(request, version)
+        response = get_cached_response(key)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            cache_response(key, response)
+        return response
+
+
+class AsyncReadMixin:
+    """
+    Списки и карточки под ASGI обрабатываются асинхронным представлением
+    (api.v1.async_reads), если включена настройка ASYNC_READS.
+    """
+
+    async_read_actions = ('list', 'retrieve')
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if (
+            settings.ASYNC_READS
+            and (actions or {}).get('get') in cls.async_read_actions
+        ):
+            return async_read_view(view)
+        return view
+
+
+class ValuesListMixin:
+    """
+    Список сериализуется из строк `.values()` сериализатором
+    `values_serializer_class`, если имя вьюсета есть в настройке
+    VALUES_LIST_VIEWSETS.
+    """
+
+    values_serializer_class = None
+
+    def uses_values_serializer(self):
+        return (
+            self.action == 'list'
+            and self.values_serializer_class is not None
+            and self.basename in settings.VALUES_LIST_VIEWSETS
+        )
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.uses_values_serializer():
+            return self.values_serializer_class.values(queryset)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and self.uses_values_serializer():
+            kwargs.setdefault('context', self.get_serializer_context())
+            return self.values_serializer_class(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+
+class ReplicaReadMixin:
+    """
+    Безопасные запросы читают с реплики базы (core.db.routers).
+
+    Пользователь, недавно писавший через вьюсет, читает с основной базы,
+    чтобы видеть свои изменения. Выбор реплики действует до конца
+    dispatch(), в том числе при необработанном исключении: иначе поток
+    WSGI читал бы с реплики и в следующих запросах.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        token = read_database.set(read_database.get())
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            read_database.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if (
+            request.method in permissions.SAFE_METHODS
+            and not is_pinned_to_primary(request.user)
+        ):
+            read_database.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if request.method not in permissions.SAFE_METHODS:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ConditionalListMixin(ConditionalGetMixin):
+    """Условный GET для списка объектов."""
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalGetMixin):
+    """Условный GET для одного объекта."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+
 class CreateListDestroyViewSet(
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    ConditionalListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.DestroyModelMixin,
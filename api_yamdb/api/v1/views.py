@@ -1,4 +1,7 @@
-from django.db.models import Avg
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, transaction
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils.encoding import force_str
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import (
     permissions,
@@ -7,15 +10,27 @@ from rest_framework import (
     viewsets,
 )
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import ChoiceField
 from rest_framework.filters import SearchFilter
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
 
 from api.v1 import serializers
-from api.v1.filters import TitleFilter
-from api.v1.view_sets import CreateListDestroyViewSet
+from api.v1.bulk import TitleBulkWriter
+from api.v1.filters import TitleFilter, TitleSearchFilter
+from api.v1.paginations import PublicationPagination, TitlePagination
+from api.v1.view_sets import (
+    AsyncReadMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CreateListDestroyViewSet,
+    ReplicaReadMixin,
+    ValuesListMixin
+)
 from api.v1.permissions import (
     IsAdminUserOrReadOnly,
     IsAuthorModeratorAdminSuperUserOrReadOnly,
@@ -30,15 +45,44 @@ from api.v1.serializers import (
     UserCreateSerializer,
     UserSerializer
 )
+from core.constants import (
+    DUPLICATE_REVIEW_MESSAGE,
+    MAX_SCORE,
+    MIN_SCORE,
+    TITLES_BULK_LIMIT,
+    TITLES_BULK_LIMIT_MESSAGE
+)
+from reviews.export import CSV_TABLES, iter_csv, iter_ndjson, spool
 from reviews.models import (
     Category,
+    Comment,
     Genre,
     Review,
     Title
 )
+from users.authentication import RoleAccessToken
 from users.models import User
 
 
+def invalid_choice(value):
+    return force_str(
+        ChoiceField.default_error_messages['invalid_choice']
+    ).format(input=value)
+
+
+def streaming_response(request, chunks, content_type):
+    """
+    Потоковый ответ из строк chunks.
+
+    Под ASGI Django 3.2 перебирает содержимое ответа в цикле событий, где
+    запросы к БД запрещены, поэтому строки сначала записываются во
+    временный файл в потоке представления, а отдаётся уже файл.
+    """
+    if isinstance(request._request, ASGIRequest):
+        return FileResponse(spool(chunks), content_type=content_type)
+    return StreamingHttpResponse(chunks, content_type=content_type)
+
+
 class UserCreateView(views.APIView):
     queryset = User.objects.all()
     serializer_class = UserCreateSerializer
@@ -82,22 +126,23 @@ class UserViewSet(
     )
     def get_me(self, request):
         """Получение пользователем подробной информации о себе."""
+        user = get_object_or_404(User, pk=request.user.pk)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True,
                 context={'request': request}
             )
             serializer.is_valid(raise_exception=True)
             serializer.save(
-                role=request.user.role
+                role=user.role
             )
             return Response(
                 serializer.data,
                 status=status.HTTP_200_OK
             )
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(user)
         return Response(
             serializer.data,
             status=status.HTTP_200_OK
@@ -117,7 +162,7 @@ class JWTView(views.APIView):
         serializer.is_valid(raise_exception=True)
         username = serializer.validated_data.get('username')
         user = get_object_or_404(User, username=username)
-        message = {'token': str(AccessToken.for_user(user))}
+        message = {'token': str(RoleAccessToken.for_user(user))}
         return Response(message, status=status.HTTP_200_OK)
 
 
@@ -126,6 +171,7 @@ class GenreViewSet(CreateListDestroyViewSet):
 
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    version_resource = 'genres'
 
 
 class CategoriesViewSet(CreateListDestroyViewSet):
@@ -133,17 +179,28 @@ class CategoriesViewSet(CreateListDestroyViewSet):
 
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    version_resource = 'categories'
 
 
-class TitleViewSet(ModelViewSet):
+class TitleViewSet(
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    ValuesListMixin,
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    ModelViewSet
+):
     """Управление произведениями."""
 
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')
-    ).all().order_by('-year')
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('-year', 'id')
     permission_classes = (IsAdminUserOrReadOnly,)
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = TitlePagination
+    filter_backends = (DjangoFilterBackend, TitleSearchFilter)
     filterset_class = TitleFilter
+    version_resource = 'titles'
+    values_serializer_class = serializers.TitleValuesSerializer
     http_method_names = (
         'get',
         'post',
@@ -152,21 +209,105 @@ class TitleViewSet(ModelViewSet):
     )
 
     def get_serializer_class(self):
-        if self.action in permissions.SAFE_METHODS:
+        if self.action in ('list', 'retrieve'):
             return TitleReadSerializer
         return TitleWriteSerializer
 
+    @action(detail=False, methods=('post', 'patch'))
+    def bulk(self, request):
+        """
+        Создание (POST) или изменение (PATCH) списка произведений.
+
+        Ответ содержит для каждого произведения `id` или `errors`.
+        """
+        if not isinstance(request.data, list):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                ListSerializer.default_error_messages['not_a_list'].format(
+                    input_type=type(request.data).__name__
+                )
+            ]})
+        if len(request.data) > TITLES_BULK_LIMIT:
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [TITLES_BULK_LIMIT_MESSAGE]
+            })
+        partial = request.method == 'PATCH'
+        results = TitleBulkWriter(request.data, partial=partial).save()
+        if not any('id' in result for result in results):
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif partial:
+            response_status = status.HTTP_200_OK
+        else:
+            response_status = status.HTTP_201_CREATED
+        return Response({'results': results}, status=response_status)
+
+    @action(detail=False, methods=('get',))
+    def export(self, request):
+        """
+        Потоковая выгрузка каталога.
+
+        `type=ndjson` (по умолчанию) — произведения построчно в JSON,
+        `type=csv&table=...` — файл в формате load_csv_in_db.
+        """
+        export_type = request.query_params.get('type', 'ndjson')
+        if export_type == 'ndjson':
+            file_name = 'titles.ndjson'
+            response = streaming_response(
+                request, iter_ndjson(), 'application/x-ndjson'
+            )
+        elif export_type == 'csv':
+            table = request.query_params.get('table', 'titles')
+            file_name = f'{table}.csv'
+            if file_name not in CSV_TABLES:
+                raise ValidationError({'table': [invalid_choice(table)]})
+            response = streaming_response(
+                request, iter_csv(file_name), 'text/csv'
+            )
+        else:
+            raise ValidationError({'type': [invalid_choice(export_type)]})
+        response['Content-Disposition'] = (
+            f'attachment; filename="{file_name}"'
+        )
+        return response
+
+    @action(detail=True, methods=('get',))
+    def stats(self, request, pk=None):
+        """Количество отзывов, средняя оценка и распределение оценок."""
+        return self.conditional_response(self.get_stats, request, pk=pk)
 
-class ReviewViewSet(ModelViewSet):
+    def get_stats(self, request, pk=None):
+        title = get_object_or_404(
+            Title.objects.only('rating_sum', 'rating_count'), pk=pk
+        )
+        distribution = dict.fromkeys(range(MIN_SCORE, MAX_SCORE + 1), 0)
+        distribution.update(
+            title.score_counts.filter(count__gt=0).values_list(
+                'score', 'count'
+            )
+        )
+        return Response({
+            'count': title.rating_count,
+            'average': title.rating,
+            'distribution': distribution,
+        })
+
+
+class ReviewViewSet(
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    ValuesListMixin,
+    ModelViewSet
+):
     """
     Управление отзывами.
     """
 
     serializer_class = serializers.ReviewSerializer
+    values_serializer_class = serializers.ReviewValuesSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsAuthorModeratorAdminSuperUserOrReadOnly
     )
+    pagination_class = PublicationPagination
     http_method_names = (
         'get',
         'post',
@@ -175,29 +316,56 @@ class ReviewViewSet(ModelViewSet):
     )
 
     def get_title(self):
-        return get_object_or_404(
-            Title,
-            pk=self.kwargs.get('title_id')
-        )
+        """Произведение из URL, запрашивается не больше раза за запрос."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title,
+                pk=self.kwargs.get('title_id')
+            )
+        return self._title
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        if self.action == 'list':
+            reviews = self.get_title().reviews.all()
+        else:
+            # Отзыв ищется сразу с условием на произведение, без отдельного
+            # запроса самого произведения.
+            reviews = Review.objects.filter(
+                title_id=self.kwargs.get('title_id')
+            )
+        return reviews.select_related('author').order_by('-pub_date', 'id')
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-            title=self.get_title()
-        )
-
-
-class CommentViewSet(ModelViewSet):
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                serializer.save(
+                    author=self.request.user,
+                    title=title
+                )
+        except IntegrityError:
+            if not title.reviews.filter(author=self.request.user).exists():
+                raise
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]
+            })
+
+
+class CommentViewSet(
+    AsyncReadMixin,
+    ReplicaReadMixin,
+    ValuesListMixin,
+    ModelViewSet
+):
     """Управление комментариями."""
 
     serializer_class = serializers.CommentSerializer
+    values_serializer_class = serializers.CommentValuesSerializer
     permission_classes = (
         permissions.IsAuthenticatedOrReadOnly,
         IsAuthorModeratorAdminSuperUserOrReadOnly
     )
+    pagination_class = PublicationPagination
     http_method_names = (
         'get',
         'post',
@@ -206,14 +374,24 @@ class CommentViewSet(ModelViewSet):
     )
 
     def get_review(self):
-        return get_object_or_404(
-            Review,
-            pk=self.kwargs.get('review_id'),
-            title=self.kwargs.get('title_id')
-        )
+        """Отзыв из URL, запрашивается не больше раза за запрос."""
+        if not hasattr(self, '_review'):
+            self._review = get_object_or_404(
+                Review,
+                pk=self.kwargs.get('review_id'),
+                title=self.kwargs.get('title_id')
+            )
+        return self._review
 
     def get_queryset(self):
-        return self.get_review().comments.all().select_related('author')
+        if self.action == 'list':
+            comments = self.get_review().comments.all()
+        else:
+            comments = Comment.objects.filter(
+                review_id=self.kwargs.get('review_id'),
+                review__title_id=self.kwargs.get('title_id')
+            )
+        return comments.select_related('author').order_by('-pub_date', 'id')
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, review=self.get_review())
@@ -1,3 +1,4 @@
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -35,6 +36,37 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Метрики запросов (api.middleware.MetricsMiddleware): заголовок
+# Server-Timing, гистограммы по маршрутам в METRICS_DIR, выгрузка командой
+# dump_metrics и по адресу /metrics. Адрес /metrics доступен только с
+# IP-адресов из METRICS_ALLOWED_IPS (через запятую).
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_DIR = os.getenv('METRICS_DIR', str(BASE_DIR / 'metrics'))
+METRICS_FLUSH_INTERVAL = 10
+METRICS_ALLOWED_IPS = [
+    address for address in os.getenv(
+        'METRICS_ALLOWED_IPS', '127.0.0.1,::1'
+    ).split(',') if address
+]
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'api.middleware.MetricsMiddleware')
+
+# Асинхронное чтение под ASGI (api.v1.async_reads): GET списков и карточек
+# каталога, списков отзывов и комментариев выполняются в пуле из
+# ASYNC_READ_WORKERS потоков. Выключено по умолчанию: в замерах
+# benchmarks/asgi.py режим медленнее обычного ASGI.
+ASYNC_READS = os.getenv('ASYNC_READS', 'False') == 'True'
+ASYNC_READ_WORKERS = int(os.getenv('ASYNC_READ_WORKERS', 8))
+
+# Вьюсеты (basename в router_v1), списки которых сериализуются из строк
+# `.values()` без ModelSerializer (api.v1.view_sets.ValuesListMixin).
+VALUES_LIST_VIEWSETS = tuple(
+    name for name in os.getenv(
+        'VALUES_LIST_VIEWSETS', 'titles,reviews,comments'
+    ).split(',') if name
+)
+
 ROOT_URLCONF = 'api_yamdb.urls'
 
 TEMPLATES_DIR = BASE_DIR / 'templates'
@@ -57,13 +89,46 @@ TEMPLATES = [
 WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 
+# Настройки соединений SQLite (core.db.backends.sqlite3): WAL позволяет
+# читать во время записи, NORMAL не ждёт fsync на каждой транзакции в WAL.
+SQLITE_PRAGMAS = {
+    'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+    'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+    'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT', 5000)),
+    'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -64 * 1024)),
+    'temp_store': os.getenv('SQLITE_TEMP_STORE', 'MEMORY'),
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'core.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'pragmas': SQLITE_PRAGMAS,
+        },
     }
 }
 
+# Реплики для чтения (core.db.routers.ReplicaRouter): файлы SQLite через
+# запятую в SQLITE_REPLICAS. Безопасные запросы каталога, отзывов и
+# комментариев читают с них по очереди, после записи пользователь
+# REPLICA_STICKY_SECONDS читает с основной базы.
+SQLITE_REPLICAS = [
+    path for path in os.getenv('SQLITE_REPLICAS', '').split(',') if path
+]
+for _number, _path in enumerate(SQLITE_REPLICAS, 1):
+    DATABASES[f'replica_{_number}'] = {
+        **DATABASES['default'],
+        'NAME': _path,
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_REPLICAS = tuple(
+    alias for alias in DATABASES if alias != 'default'
+)
+DATABASE_ROUTERS = ['core.db.routers.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -98,14 +163,27 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 AUTH_USER_MODEL = 'users.User'
 
+# Аутентификация по утверждениям токена без запроса пользователя к БД.
+# Метки изменения пользователей хранятся в кэше default, поэтому режим
+# работает только с общим для всех процессов бэкендом (DEFAULT_CACHE_BACKEND
+# file или redis).
+CACHED_JWT_AUTHENTICATION = os.getenv(
+    'CACHED_JWT_AUTHENTICATION', 'False'
+) == 'True'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication'
+        if CACHED_JWT_AUTHENTICATION
+        else 'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
@@ -116,6 +194,60 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Сколько секунд процесс доверяет роли пользователя из токена, не проверяя
+# метку изменения в кэше.
+USER_STATE_CACHE_TTL = 30
+# Сколько пользователей процесс помнит одновременно.
+USER_STATE_CACHE_SIZE = int(os.getenv('USER_STATE_CACHE_SIZE', 10000))
+
+# Кэш ответов анонимным пользователям для каталога. Бэкенд выбирается
+# переменной окружения RESPONSE_CACHE_BACKEND: locmem, file или redis
+# (нужен пакет django-redis), адрес — RESPONSE_CACHE_LOCATION.
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'responses'),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        str(BASE_DIR / 'response_cache'),
+    ),
+    'redis': ('django_redis.cache.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+_response_cache_backend, _response_cache_location = RESPONSE_CACHE_BACKENDS[
+    os.getenv('RESPONSE_CACHE_BACKEND', 'locmem')
+]
+
+# Кэш default: метки версий справочников и изменений пользователей.
+# Бэкенд выбирается переменной DEFAULT_CACHE_BACKEND (locmem, file или
+# redis), адрес — DEFAULT_CACHE_LOCATION.
+DEFAULT_CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', ''),
+    'file': (
+        'django.core.cache.backends.filebased.FileBasedCache',
+        str(BASE_DIR / 'default_cache'),
+    ),
+    'redis': ('django_redis.cache.RedisCache', 'redis://127.0.0.1:6379/0'),
+}
+_default_cache_backend, _default_cache_location = DEFAULT_CACHE_BACKENDS[
+    os.getenv('DEFAULT_CACHE_BACKEND', 'locmem')
+]
+
+CACHES = {
+    'default': {
+        'BACKEND': _default_cache_backend,
+        'LOCATION': os.getenv(
+            'DEFAULT_CACHE_LOCATION', _default_cache_location
+        ),
+    },
+    RESPONSE_CACHE_ALIAS: {
+        'BACKEND': _response_cache_backend,
+        'LOCATION': os.getenv(
+            'RESPONSE_CACHE_LOCATION', _response_cache_location
+        ),
+        'TIMEOUT': RESPONSE_CACHE_TIMEOUT,
+    },
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
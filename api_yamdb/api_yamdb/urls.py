@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
+from api.metrics import prometheus_view
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -11,4 +13,5 @@ urlpatterns = [
         TemplateView.as_view(template_name='redoc.html'),
         name='redoc'
     ),
+    path('metrics', prometheus_view, name='metrics'),
 ]
@@ -4,6 +4,7 @@ MAX_LENGTH_EMAIL = 254
 
 # Константы для остальных моделей
 LENG_MAX = 256
+LENG_PATH = 1024
 LENG_CUT = 30
 MIN_SCORE = 1
 MAX_SCORE = 10
@@ -18,6 +19,13 @@ USER_ROLES = {
 # Тема письма при отправки токена
 CONFIRM_CODE_MESSAGE = 'Код для подтверждения регистрации на api_yamdb'
 
+# Очередь писем: число попыток и задержка перед повтором (удваивается)
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = 60
+EMAIL_BATCH_SIZE = 100
+# Сколько секунд письмо, взятое в отправку, не берут другие обработчики
+EMAIL_LEASE = 600
+
 
 ADDITIONAL_USER_FIElDS = (
     (None, {
@@ -35,3 +43,29 @@ FORBIDDEN_NAMES = (
 )
 
 RATING_DEFAULT_VALUE = 1
+
+# Массовая загрузка произведений: предел на запрос и размер пачки вставки
+TITLES_BULK_LIMIT = 5000
+TITLES_BULK_BATCH_SIZE = 500
+TITLES_BULK_LIMIT_MESSAGE = (
+    f'За один запрос можно передать не больше {TITLES_BULK_LIMIT} '
+    'произведений.'
+)
+TITLE_NOT_FOUND_MESSAGE = 'Произведение не найдено.'
+TITLE_REPEATED_MESSAGE = 'Произведение указано в запросе несколько раз.'
+
+# Сколько закодированных категорий и наборов жанров хранит процесс
+JSON_FRAGMENT_CACHE_SIZE = 1024
+
+DUPLICATE_REVIEW_MESSAGE = (
+    'Можно оставить только один отзыв для одного произведения!'
+)
+
+# Конфигурация полнотекстового поиска PostgreSQL
+SEARCH_CONFIG = 'russian'
+
+# Гистограммы метрик запросов: границы корзин в секундах и в запросах к БД
+METRICS_DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+METRICS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
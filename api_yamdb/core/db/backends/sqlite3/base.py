@@ -0,0 +1,49 @@
+import re
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.sqlite3 import base
+
+ALLOWED_PRAGMAS = (
+    'journal_mode',
+    'synchronous',
+    'busy_timeout',
+    'mmap_size',
+    'cache_size',
+    'temp_store',
+)
+PRAGMA_VALUE_REGEX = re.compile(r'^-?\w+$')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite с настройкой соединения через PRAGMA.
+
+    Значения берутся из OPTIONS['pragmas'] базы данных и применяются к
+    каждому новому соединению.
+    """
+
+    def get_connection_params(self):
+        self.pragmas = self.settings_dict['OPTIONS'].get('pragmas', {})
+        for name, value in self.pragmas.items():
+            if name not in ALLOWED_PRAGMAS or not PRAGMA_VALUE_REGEX.match(
+                str(value)
+            ):
+                raise ImproperlyConfigured(
+                    f'Недопустимая настройка SQLite: {name} = {value!r}.'
+                )
+        options = {
+            key: value for key, value in self.settings_dict['OPTIONS'].items()
+            if key != 'pragmas'
+        }
+        settings_dict = {**self.settings_dict, 'OPTIONS': options}
+        original, self.settings_dict = self.settings_dict, settings_dict
+        try:
+            return super().get_connection_params()
+        finally:
+            self.settings_dict = original
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
@@ -0,0 +1,67 @@
+from contextvars import ContextVar
+from itertools import count
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+PRIMARY_PINNED_KEY = 'db:primary:{}'
+
+# Реплика, с которой читает текущий запрос; None — основная база.
+read_database = ContextVar('read_database', default=None)
+
+_replica_counter = count()
+
+
+def choose_replica():
+    """Следующая реплика из settings.DATABASE_REPLICAS по кругу."""
+    replicas = settings.DATABASE_REPLICAS
+    if not replicas:
+        return None
+    return replicas[next(_replica_counter) % len(replicas)]
+
+
+def pin_to_primary(user):
+    """
+    Направляет чтение пользователя на основную базу на время
+    REPLICA_STICKY_SECONDS, пока реплики догоняют его запись.
+
+    Метка хранится в кэше Django (для нескольких процессов нужен общий
+    бэкенд).
+    """
+    if user.is_authenticated and settings.REPLICA_STICKY_SECONDS > 0:
+        cache.set(
+            PRIMARY_PINNED_KEY.format(user.pk),
+            True,
+            timeout=settings.REPLICA_STICKY_SECONDS,
+        )
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(
+        PRIMARY_PINNED_KEY.format(user.pk), False
+    )
+
+
+class ReplicaRouter:
+    """
+    Чтение с реплики, выбранной для запроса, запись — в основную базу.
+
+    Реплику выбирает вьюсет (api.v1.view_sets.ReplicaReadMixin) для
+    безопасных запросов, вне таких запросов всё идёт в основную базу.
+    После первой записи запрос до конца читает с основной базы.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get()
+
+    def db_for_write(self, model, **hints):
+        if read_database.get() is not None:
+            read_database.set(None)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if {obj1._state.db, obj2._state.db} <= databases:
+            return True
+        return None
@@ -1,14 +1,24 @@
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 
 from api_yamdb.settings import EMAIL_ADMIN
+from users.models import OutgoingEmail
 from .constants import CONFIRM_CODE_MESSAGE
 
 
 def send_confirmation_code(email, code):
-    send_mail(
+    """Ставит письмо с кодом подтверждения в очередь отправки."""
+    return OutgoingEmail.objects.create(
+        recipient=email,
         subject=CONFIRM_CODE_MESSAGE,
-        message=f'Код подтверждения: {code}',
+        body=f'Код подтверждения: {code}',
+    )
+
+
+def build_message(outgoing_email, connection):
+    return EmailMessage(
+        subject=outgoing_email.subject,
+        body=outgoing_email.body,
         from_email=EMAIL_ADMIN,
-        recipient_list=(email,),
-        fail_silently=False,
+        to=(outgoing_email.recipient,),
+        connection=connection,
     )
@@ -5,6 +5,7 @@ from reviews.models import (
     Category,
     Comment,
     Genre,
+    ImportCheckpoint,
     Review,
     Title
 )
@@ -46,3 +47,9 @@ class ReviewAdmin(admin.ModelAdmin):
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('review', 'author', 'pub_date')
     search_fields = ('review__title__name', 'author__username', 'text')
+
+
+@admin.register(ImportCheckpoint)
+class ImportCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('path', 'rows', 'completed', 'updated_at')
+    list_filter = ('completed',)
@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class ReviewsConfig(AppConfig):
     name = 'reviews'
     verbose_name = 'Модели категорий, жанров, произведений и т.д.'
+
+    def ready(self):
+        from reviews import signals  # noqa: F401
+        from reviews.lookups import invalidate_lookups
+        from reviews.search import install_search_index
+
+        post_migrate.connect(install_search_index, sender=self)
+        post_migrate.connect(invalidate_lookups, sender=self)
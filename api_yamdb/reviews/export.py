@@ -0,0 +1,96 @@
+import csv
+import json
+import tempfile
+from itertools import islice
+
+from reviews.models import Category, Genre, Title
+
+CHUNK_SIZE = 2000
+# Выгрузка до этого размера в байтах собирается в памяти, больше — на диске.
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Файлы каталога в формате load_csv_in_db: модель и колонки.
+CSV_TABLES = {
+    'category.csv': (Category, ('id', 'name', 'slug')),
+    'genre.csv': (Genre, ('id', 'name', 'slug')),
+    'titles.csv': (
+        Title,
+        (
+            'id', 'name', 'year', 'description', 'category',
+            'rating_sum', 'rating_count',
+        ),
+    ),
+    'genre_title.csv': (Title.genre.through, ('id', 'title_id', 'genre_id')),
+}
+TITLE_FIELDS = ('id', 'name', 'year', 'description', 'category__slug')
+
+
+class Echo:
+    """Файлоподобный объект для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(file_name, chunk_size=CHUNK_SIZE):
+    """Строки CSV файла каталога, включая заголовок."""
+    model, columns = CSV_TABLES[file_name]
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    attnames = [model._meta.get_field(column).attname for column in columns]
+    rows = model.objects.order_by('pk').values_list(*attnames)
+    for row in rows.iterator(chunk_size=chunk_size):
+        yield writer.writerow(row)
+
+
+def iter_titles(chunk_size=CHUNK_SIZE):
+    """
+    Произведения с категорией, жанрами и рейтингом пачками по chunk_size.
+
+    Жанры выбираются одним запросом на пачку, поэтому в памяти
+    одновременно находится не больше одной пачки.
+    """
+    titles = (
+        Title.objects.order_by('pk')
+        .values(*TITLE_FIELDS, 'rating_sum', 'rating_count')
+        .iterator(chunk_size=chunk_size)
+    )
+    chunk = list(islice(titles, chunk_size))
+    while chunk:
+        genres = {title['id']: [] for title in chunk}
+        for title_id, slug in Title.genre.through.objects.filter(
+            title_id__in=genres
+        ).order_by('title_id', 'genre__slug').values_list(
+            'title_id', 'genre__slug'
+        ):
+            genres[title_id].append(slug)
+        for title in chunk:
+            rating_sum = title.pop('rating_sum')
+            rating_count = title.pop('rating_count')
+            title['category'] = title.pop('category__slug')
+            title['genre'] = genres[title['id']]
+            title['rating'] = (
+                rating_sum / rating_count if rating_count else None
+            )
+            yield title
+        chunk = list(islice(titles, chunk_size))
+
+
+def iter_ndjson(chunk_size=CHUNK_SIZE):
+    """
+    Произведения построчно в JSON.
+
+    Поля совпадают с форматом записи произведения (категория и жанры —
+    слаги), поэтому выгрузку можно загрузить через /titles/bulk/.
+    """
+    for title in iter_titles(chunk_size):
+        yield json.dumps(title, ensure_ascii=False) + '\n'
+
+
+def spool(chunks, max_size=SPOOL_MAX_SIZE):
+    """Временный файл со строками chunks в UTF-8, открытый с начала."""
+    file = tempfile.SpooledTemporaryFile(max_size=max_size)
+    for chunk in chunks:
+        file.write(chunk.encode())
+    file.seek(0)
+    return file
@@ -0,0 +1,87 @@
+from django.db import DEFAULT_DB_ALIAS
+
+from reviews.models import Category, Genre, ResourceVersion
+
+# Версия незагруженной копии: не совпадает ни с какой версией из БД,
+# в том числе с отсутствующей (None).
+NOT_LOADED = object()
+
+
+class LookupCache:
+    """
+    Объекты небольшой редко меняющейся таблицы в памяти процесса.
+
+    Таблица загружается целиком из основной базы и ищется по slug и по id.
+    Загруженная копия действует, пока не изменится версия ресурса
+    `resource` (ResourceVersion) в основной базе: её меняет та же
+    транзакция, что пишет в таблицу, поэтому изменение видно всем
+    процессам сразу после фиксации. Объекты общие для всех запросов
+    процесса и не должны изменяться.
+    """
+
+    def __init__(self, model, resource):
+        self.model = model
+        self.resource = resource
+        # (версия, slug -> объект, id -> объект)
+        self.state = (NOT_LOADED, {}, {})
+
+    def get_version(self):
+        # Вместе с номером сравнивается время: после очистки таблицы
+        # версий номера начинаются заново.
+        return ResourceVersion.objects.using(DEFAULT_DB_ALIAS).filter(
+            name=self.resource
+        ).values_list('version', 'updated_at').first()
+
+    def load(self, force=False):
+        version = self.get_version()
+        if force or version != self.state[0]:
+            # Версия читается до данных: запись между ними приведёт
+            # к повторной загрузке, а не к устаревшей копии.
+            objects = list(
+                self.model._default_manager.using(DEFAULT_DB_ALIAS)
+            )
+            self.state = (
+                version,
+                {instance.slug: instance for instance in objects},
+                {instance.pk: instance for instance in objects},
+            )
+        return self.state
+
+    def get(self, index, required):
+        """
+        Словарь из state[index].
+
+        Если каких-то ключей из required нет, таблица перечитывается:
+        запись в обход сигналов (например, bulk_create) не меняет версию.
+        """
+        objects = self.load()[index]
+        if any(key not in objects for key in required):
+            objects = self.load(force=True)[index]
+        return objects
+
+    def slugs(self, required=()):
+        """Словарь slug -> объект."""
+        return self.get(1, required)
+
+    def ids(self, required=()):
+        """Словарь id -> объект."""
+        return self.get(2, required)
+
+    def invalidate(self):
+        """Сбрасывает копию таблицы в текущем процессе."""
+        self.state = (NOT_LOADED, {}, {})
+
+
+genres = LookupCache(Genre, 'genres')
+categories = LookupCache(Category, 'categories')
+
+LOOKUPS = {
+    Genre: genres,
+    Category: categories,
+}
+
+
+def invalidate_lookups(**kwargs):
+    """Сбрасывает все таблицы процесса, например после flush."""
+    for lookup in LOOKUPS.values():
+        lookup.invalidate()
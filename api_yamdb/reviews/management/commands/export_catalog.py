@@ -0,0 +1,58 @@
+import os
+
+from django.core.management import BaseCommand, CommandError
+
+from reviews.export import CHUNK_SIZE, CSV_TABLES, iter_csv, iter_ndjson
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Выгружает каталог: CSV файлы для load_csv_in_db --incremental '
+        'или произведения в NDJSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format',
+            choices=('csv', 'ndjson'),
+            default='csv',
+            help='Формат выгрузки',
+        )
+        parser.add_argument(
+            '--data-dir',
+            help='Каталог для CSV файлов',
+        )
+        parser.add_argument(
+            '--output',
+            help='Файл для NDJSON, по умолчанию стандартный вывод',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Количество строк, читаемых из БД за один раз',
+        )
+
+    def handle(self, *args, **options):
+        if options['format'] == 'ndjson':
+            self.export_ndjson(options['output'], options['chunk_size'])
+            return
+        if not options['data_dir']:
+            raise CommandError('Для выгрузки в CSV укажите --data-dir.')
+        os.makedirs(options['data_dir'], exist_ok=True)
+        for file_name in CSV_TABLES:
+            path = os.path.join(options['data_dir'], file_name)
+            with open(path, 'w', encoding='utf-8', newline='') as file:
+                file.writelines(iter_csv(file_name, options['chunk_size']))
+            self.stdout.write(f'Файл {file_name} выгружен')
+        self.stdout.write(self.style.SUCCESS('Каталог выгружен'))
+
+    def export_ndjson(self, output, chunk_size):
+        if output is None:
+            for line in iter_ndjson(chunk_size):
+                self.stdout.write(line, ending='')
+            return
+        with open(output, 'w', encoding='utf-8') as file:
+            file.writelines(iter_ndjson(chunk_size))
+        self.stdout.write(self.style.SUCCESS(f'Каталог выгружен в {output}'))
@@ -1,56 +1,462 @@
-import os
 import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import ExitStack, contextmanager, nullcontext
+from itertools import islice
+from multiprocessing import Lock
 
-from django.core.management import BaseCommand
+import django
+from django.apps import apps
 from django.conf import settings
-from django.db import transaction
+from django.core.management import BaseCommand, CommandError, call_command
+from django.db import connections, transaction
 
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category,
+    Comment,
+    Genre,
+    ImportCheckpoint,
+    ResourceVersion,
+    Review,
+    Title
+)
+from users.authentication import invalidate_users
 from users.models import User
 
 FILE_DIR = os.path.join(settings.BASE_DIR, 'static', 'data')
+BATCH_SIZE = 1000
 
 TABLES = {
     User: 'users.csv',
     Category: 'category.csv',
     Genre: 'genre.csv',
     Title: 'titles.csv',
+    Title.genre.through: 'genre_title.csv',
     Review: 'review.csv',
     Comment: 'comments.csv',
 }
 
 
+def get_attnames(model, header):
+    """Сопоставляет колонки CSV (`author`, `title_id`) с полями модели."""
+    return [model._meta.get_field(column).attname for column in header]
+
+
+def read_batches(rows, batch_size):
+    """Читает строки пачками не больше batch_size."""
+    rows = iter(rows)
+    batch = list(islice(rows, batch_size))
+    while batch:
+        yield batch
+        batch = list(islice(rows, batch_size))
+
+
+@contextmanager
+def keep_auto_now_add(model, attnames):
+    """Сохраняет даты из CSV вместо подстановки текущего времени."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False) and field.attname in attnames
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def get_dependencies(tables):
+    """Строит граф зависимостей таблиц по внешним ключам."""
+    return {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation
+            and field.related_model in tables
+            and field.related_model is not model
+        }
+        for model in tables
+    }
+
+
+def insert_rows(model, attnames, rows):
+    """Вставляет пачку строк в отдельной транзакции."""
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    objects = [model(**dict(zip(attnames, row))) for row in rows]
+    with write_lock(), transaction.atomic(), keep_auto_now_add(
+        model, attnames
+    ):
+        model.objects.bulk_create(objects, batch_size=len(objects))
+    return len(objects)
+
+
+def upsert_rows(model, attnames, rows):
+    """
+    Вставляет новые строки и обновляет уже существующие по первичному ключу.
+
+    Django 3.2 не умеет `bulk_create(update_conflicts=True)`, поэтому
+    существующие ключи выбираются одним запросом и обновляются через
+    bulk_update.
+    """
+    if isinstance(model, str):
+        model = apps.get_model(model)
+    pk_field = model._meta.pk
+    objects = [model(**dict(zip(attnames, row))) for row in rows]
+    for instance in objects:
+        instance.pk = pk_field.to_python(instance.pk)
+    existing = set(model.objects.filter(
+        pk__in=[instance.pk for instance in objects]
+    ).values_list('pk', flat=True))
+    update_fields = [
+        field.name for field in model._meta.concrete_fields
+        if field.attname in attnames and not field.primary_key
+    ]
+    with keep_auto_now_add(model, attnames):
+        model.objects.bulk_create(
+            [instance for instance in objects if instance.pk not in existing]
+        )
+    if existing and update_fields:
+        model.objects.bulk_update(
+            [instance for instance in objects if instance.pk in existing],
+            update_fields,
+        )
+        if model is User:
+            # bulk_update не вызывает сигналы: роли в ранее выданных
+            # токенах обновлённых пользователей сбрасываются явно.
+            invalidate_users(existing)
+    return len(objects)
+
+
+def upsert_batch(model, attnames, rows):
+    """Вставляет или обновляет пачку строк в отдельной транзакции."""
+    with write_lock(), transaction.atomic():
+        return upsert_rows(model, attnames, rows)
+
+
+_write_lock = None
+
+
+def write_lock():
+    """
+    Блокировка записи между процессами пула для SQLite.
+
+    SQLite допускает одного писателя, а конкурирующие транзакции сразу
+    получают `database is locked`, поэтому параллельно собираются только
+    объекты, а запись идёт по очереди.
+    """
+    if _write_lock is None or connections['default'].vendor != 'sqlite':
+        return nullcontext()
+    return _write_lock
+
+
+def setup_worker(lock):
+    """Инициализирует Django в процессе пула (нужно для spawn)."""
+    global _write_lock
+    _write_lock = lock
+    django.setup()
+
+
+class TableReader:
+    """Потоковое чтение CSV файла таблицы пачками."""
+
+    def __init__(self, model, path, batch_size, stack, offset=0):
+        self.model = model
+        self.path = path
+        self.file = stack.enter_context(
+            open(path, 'r', encoding='utf-8', newline='')
+        )
+        # readline вместо итерации по файлу, чтобы работал tell().
+        reader = csv.reader(iter(self.file.readline, ''))
+        self.attnames = get_attnames(model, next(reader, ()))
+        if offset:
+            self.file.seek(offset)
+        self.batches = read_batches(reader, batch_size)
+        self.exhausted = False
+        self.rows_read = 0
+        self.rows_inserted = 0
+        self.in_flight = 0
+        # Контрольная точка и отправленные пачки в порядке чтения:
+        # [позиция после пачки, строк, загружена].
+        self.checkpoint = None
+        self.submitted = deque()
+        self.start = time.perf_counter()
+
+    def next_batch(self):
+        batch = next(self.batches, None)
+        if batch is None:
+            self.exhausted = True
+            return None
+        first_row = self.rows_read + 1
+        self.rows_read += len(batch)
+        return first_row, batch
+
+    @property
+    def finished(self):
+        return self.exhausted and not self.in_flight
+
+    @property
+    def position(self):
+        return self.file.tell()
+
+
 class Command(BaseCommand):
 
     help = 'Импортирует данные из CSV файлов'
 
-    def handle(self, *args, **kwargs):
-        self.import_data()
-        self.load_genre_title()
-
-    def import_data(self, *args, **kwargs):
-        for model, csv_file in TABLES.items():
-            with open(
-                os.path.join(FILE_DIR, csv_file),
-                'r',
-                encoding='utf-8'
-            ) as file:
-                reader = csv.DictReader(file)
-                objects = [model(**data) for data in reader]
-                with transaction.atomic():
-                    model.objects.bulk_create(objects)
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=BATCH_SIZE,
+            help='Количество строк, читаемых и вставляемых за один раз',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=FILE_DIR,
+            help='Каталог с CSV файлами',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help=(
+                'Количество процессов. Независимые таблицы и пачки строк '
+                'одной таблицы загружаются параллельно, каждая пачка '
+                'фиксируется отдельной транзакцией. Прерванную загрузку '
+                'продолжает повторный запуск с --incremental'
+            ),
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help=(
+                'Обновлять существующие строки вместо ошибки и продолжать '
+                'с сохранённой позиции. Отсутствующие файлы пропускаются'
+            ),
+        )
 
+    def handle(self, *args, **options):
+        paths = {
+            model: os.path.join(options['data_dir'], csv_file)
+            for model, csv_file in TABLES.items()
+        }
+        if options['workers'] > 1:
+            self.import_parallel(
+                paths, options['batch_size'], options['workers'],
+                options['incremental'],
+            )
+        elif options['incremental']:
+            for model, path in paths.items():
+                self.import_file_incremental(
+                    model, path, options['batch_size']
+                )
+        else:
+            for model, path in paths.items():
+                self.import_file(model, path, options['batch_size'])
+        # bulk_create и bulk_update не вызывают сигналы моделей.
+        ResourceVersion.bump('genres', 'categories')
+        call_command('recalculate_ratings', stdout=self.stdout)
         self.stdout.write(self.style.SUCCESS('Все данные загружены'))
 
-    def load_genre_title(self):
-        with open(
-            os.path.join(FILE_DIR, "genre_title.csv"), encoding="utf-8"
-        ) as csvfile:
-            reader = csv.DictReader(csvfile, delimiter=",")
-            for row in reader:
-                title, _ = Title.objects.get_or_create(id=row['title_id'])
-                genre, _ = Genre.objects.get_or_create(id=row['genre_id'])
-                title.genres.add(genre)
-                title.save()
-
-            self.stdout.write(f'Файл {csvfile.name} загружен.')
+    def import_file(self, model, path, batch_size):
+        with ExitStack() as stack:
+            reader = TableReader(model, path, batch_size, stack)
+            with transaction.atomic():
+                for _, batch in iter(reader.next_batch, None):
+                    reader.rows_inserted += insert_rows(
+                        model, reader.attnames, batch
+                    )
+        self.report(reader)
+
+    def get_checkpoint(self, path):
+        """
+        Контрольная точка файла или None, если загружать его не нужно.
+
+        Изменившийся файл (другие размер или время изменения) загружается
+        заново.
+        """
+        if not os.path.exists(path):
+            self.stdout.write(f'Файл {os.path.basename(path)} пропущен')
+            return None
+        stat = os.stat(path)
+        checkpoint, created = ImportCheckpoint.objects.get_or_create(
+            path=os.path.abspath(path),
+            defaults={'size': stat.st_size, 'modified': stat.st_mtime},
+        )
+        if (checkpoint.size, checkpoint.modified) != (
+            stat.st_size, stat.st_mtime
+        ):
+            checkpoint.size = stat.st_size
+            checkpoint.modified = stat.st_mtime
+            checkpoint.offset = checkpoint.rows = 0
+            checkpoint.completed = False
+            checkpoint.save()
+        if checkpoint.completed:
+            self.stdout.write(
+                f'Файл {os.path.basename(path)} уже загружен '
+                f'({checkpoint.rows} строк)'
+            )
+            return None
+        return checkpoint
+
+    def import_file_incremental(self, model, path, batch_size):
+        """
+        Загружает файл с продолжением с контрольной точки.
+
+        Каждая пачка и позиция после неё фиксируются одной транзакцией.
+        """
+        checkpoint = self.get_checkpoint(path)
+        if checkpoint is None:
+            return
+        with ExitStack() as stack:
+            reader = TableReader(
+                model, path, batch_size, stack, offset=checkpoint.offset
+            )
+            for _, batch in iter(reader.next_batch, None):
+                with transaction.atomic():
+                    reader.rows_inserted += upsert_rows(
+                        model, reader.attnames, batch
+                    )
+                    checkpoint.offset = reader.position
+                    checkpoint.rows += len(batch)
+                    checkpoint.save(update_fields=(
+                        'offset', 'rows', 'updated_at'
+                    ))
+            checkpoint.completed = True
+            checkpoint.save(update_fields=('completed', 'updated_at'))
+        self.report(reader)
+
+    def import_parallel(self, paths, batch_size, workers, incremental=False):
+        """
+        Загружает таблицы процессами пула в порядке зависимостей.
+
+        Таблица начинает загружаться, когда полностью загружены все
+        таблицы, на которые она ссылается. С incremental строки
+        обновляются вместо вставки, а контрольная точка файла сдвигается
+        за последнюю пачку, до которой загружены все предыдущие, поэтому
+        повторный запуск продолжает прерванную загрузку.
+        """
+        pending = get_dependencies(paths)
+        done = set()
+        checkpoints = {}
+        if incremental:
+            for model in list(pending):
+                checkpoints[model] = self.get_checkpoint(paths[model])
+                if checkpoints[model] is None:
+                    del pending[model]
+                    done.add(model)
+        readers = {}
+        futures = {}
+        lock = Lock()
+        self.checkpoint_lock = (
+            lock if connections['default'].vendor == 'sqlite'
+            else nullcontext()
+        )
+        connections.close_all()
+        with ExitStack() as stack:
+            executor = stack.enter_context(ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=setup_worker,
+                initargs=(lock,),
+            ))
+            while pending or readers:
+                for model in [
+                    model for model, dependencies in pending.items()
+                    if dependencies <= done
+                ]:
+                    del pending[model]
+                    checkpoint = checkpoints.get(model)
+                    readers[model] = TableReader(
+                        model, paths[model], batch_size, stack,
+                        offset=checkpoint.offset if checkpoint else 0,
+                    )
+                    readers[model].checkpoint = checkpoint
+                self.submit_batches(
+                    executor, readers, futures, workers * 2,
+                    upsert_batch if incremental else insert_rows,
+                )
+                if futures:
+                    completed, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        self.complete_batch(executor, future, futures)
+                for model, reader in list(readers.items()):
+                    if reader.finished:
+                        self.save_checkpoint(reader, completed=True)
+                        self.report(reader)
+                        done.add(model)
+                        del readers[model]
+
+    def complete_batch(self, executor, future, futures):
+        """Учитывает загруженную пачку или останавливает загрузку."""
+        reader, first_row, entry = futures.pop(future)
+        reader.in_flight -= 1
+        try:
+            reader.rows_inserted += future.result()
+        except Exception as error:
+            executor.shutdown(cancel_futures=True)
+            if reader.checkpoint is None:
+                hint = (
+                    'Предыдущие пачки сохранены, продолжить загрузку '
+                    'можно с --incremental.'
+                )
+            else:
+                hint = 'Повторный запуск продолжит загрузку.'
+            raise CommandError(
+                f'Ошибка загрузки {reader.path}, строки '
+                f'{first_row}-{first_row + entry[1] - 1}: {error}. {hint}'
+            ) from error
+        entry[2] = True
+        self.save_checkpoint(reader)
+
+    def save_checkpoint(self, reader, completed=False):
+        """Сдвигает контрольную точку за загруженные подряд пачки."""
+        checkpoint = reader.checkpoint
+        if checkpoint is None:
+            return
+        moved = completed
+        while reader.submitted and reader.submitted[0][2]:
+            position, rows, _ = reader.submitted.popleft()
+            checkpoint.offset = position
+            checkpoint.rows += rows
+            moved = True
+        if not moved:
+            return
+        checkpoint.completed = completed
+        with self.checkpoint_lock:
+            checkpoint.save(update_fields=(
+                'offset', 'rows', 'completed', 'updated_at'
+            ))
+
+    @staticmethod
+    def submit_batches(executor, readers, futures, limit, load=insert_rows):
+        """Отправляет пачки всех читаемых таблиц по очереди."""
+        submitted = True
+        while submitted and len(futures) < limit:
+            submitted = False
+            for reader in readers.values():
+                if len(futures) >= limit or reader.exhausted:
+                    continue
+                batch = reader.next_batch()
+                if batch is None:
+                    continue
+                first_row, rows = batch
+                future = executor.submit(
+                    load, reader.model._meta.label, reader.attnames, rows
+                )
+                entry = [reader.position, len(rows), False]
+                reader.submitted.append(entry)
+                futures[future] = (reader, first_row, entry)
+                reader.in_flight += 1
+                submitted = True
+
+    def report(self, reader):
+        elapsed = time.perf_counter() - reader.start
+        self.stdout.write(
+            f'Файл {os.path.basename(reader.path)} загружен: '
+            f'{reader.rows_inserted} строк за {elapsed:.2f} с '
+            f'({reader.rows_inserted / elapsed:.0f} строк/с)'
+        )
@@ -0,0 +1,59 @@
+from django.core.management import BaseCommand
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import ResourceVersion, Review, ScoreCount, Title
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Пересчитывает сумму, количество и распределение оценок '
+        'произведений'
+    )
+
+    def handle(self, *args, **kwargs):
+        reviews = (
+            Review.objects.filter(title=OuterRef('pk'))
+            .order_by()
+            .values('title')
+        )
+        with transaction.atomic():
+            updated = Title.objects.update(
+                rating_sum=Coalesce(
+                    Subquery(
+                        reviews.annotate(total=Sum('score')).values('total')
+                    ),
+                    0,
+                    output_field=models.PositiveIntegerField(),
+                ),
+                rating_count=Coalesce(
+                    Subquery(
+                        reviews.annotate(total=Count('id')).values('total')
+                    ),
+                    0,
+                    output_field=models.PositiveIntegerField(),
+                ),
+            )
+            ScoreCount.objects.all().delete()
+            ScoreCount.objects.bulk_create(
+                (
+                    ScoreCount(
+                        title_id=row['title'],
+                        score=row['score'],
+                        count=row['count'],
+                    )
+                    for row in Review.objects.order_by()
+                    .values('title', 'score')
+                    .annotate(count=Count('id'))
+                    .iterator()
+                ),
+                batch_size=BATCH_SIZE,
+            )
+            ResourceVersion.bump('titles')
+        self.stdout.write(self.style.SUCCESS(
+            f'Рейтинг пересчитан для {updated} произведений'
+        ))
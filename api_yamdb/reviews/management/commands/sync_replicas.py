@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+
+    help = (
+        'Копирует основную базу SQLite в реплики: замена репликации '
+        'для локального запуска и тестов'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'replicas',
+            nargs='*',
+            help='Псевдонимы реплик, по умолчанию все DATABASE_REPLICAS',
+        )
+
+    def handle(self, *args, **options):
+        replicas = options['replicas'] or settings.DATABASE_REPLICAS
+        for alias in replicas:
+            if alias not in settings.DATABASE_REPLICAS:
+                raise CommandError(f'{alias} не является репликой')
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        for alias in replicas:
+            target = connections[alias]
+            target.ensure_connection()
+            source.connection.backup(target.connection)
+        self.stdout.write(self.style.SUCCESS(
+            f'Скопировано реплик: {len(replicas)}'
+        ))
@@ -0,0 +1,56 @@
+# Generated by Django 3.2 on 2026-10-18 17:53
+
+import core.validators
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_title_rating(apps, schema_editor):
+    Title = apps.get_model('reviews', 'Title')
+    Review = apps.get_model('reviews', 'Review')
+    ratings = (
+        Review.objects.order_by()
+        .values('title')
+        .annotate(total=Sum('score'), count=Count('id'))
+    )
+    for rating in ratings.iterator():
+        Title.objects.filter(pk=rating['title']).update(
+            rating_sum=rating['total'],
+            rating_count=rating['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_auto_20241215_0820'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество оценок'),
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Сумма оценок'),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='slug',
+            field=models.SlugField(unique=True, verbose_name='Slug'),
+        ),
+        migrations.AlterField(
+            model_name='genre',
+            name='slug',
+            field=models.SlugField(unique=True, verbose_name='Slug'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.SmallIntegerField(db_index=True, validators=[core.validators.validate_year], verbose_name='Год выпуска'),
+        ),
+        migrations.RunPython(fill_title_rating, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 3.2 on 2026-10-18 17:59
+
+import core.validators
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='review',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='reviews.review', verbose_name='Отзыв'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='score',
+            field=models.PositiveSmallIntegerField(default=1, error_messages={'validators': 'Оценка от 1 до 10!'}, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Оценка'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='title',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='reviews.title', verbose_name='Произведение'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='category',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.PROTECT, related_name='titles', to='reviews.category', verbose_name='Категория'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='description',
+            field=models.TextField(blank=True, max_length=256, verbose_name='Описание'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='name',
+            field=models.CharField(max_length=256, verbose_name='Название'),
+        ),
+        migrations.AlterField(
+            model_name='title',
+            name='year',
+            field=models.SmallIntegerField(validators=[core.validators.validate_year], verbose_name='Год выпуска'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', '-year', 'id'], name='title_category_year_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 18:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_audit_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=1024, unique=True, verbose_name='Путь к файлу')),
+                ('size', models.PositiveBigIntegerField(verbose_name='Размер файла')),
+                ('modified', models.FloatField(verbose_name='Время изменения файла')),
+                ('offset', models.PositiveBigIntegerField(default=0, verbose_name='Позиция в файле')),
+                ('rows', models.PositiveBigIntegerField(default=0, verbose_name='Загружено строк')),
+                ('completed', models.BooleanField(default=False, verbose_name='Загружен полностью')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата и время обновления')),
+            ],
+            options={
+                'verbose_name': 'Контрольная точка импорта',
+                'verbose_name_plural': 'Контрольные точки импорта',
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 3.2 on 2026-10-18 18:14
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResourceVersion',
+            fields=[
+                ('name', models.CharField(max_length=30, primary_key=True, serialize=False, verbose_name='Ресурс')),
+                ('version', models.PositiveBigIntegerField(default=0, verbose_name='Версия')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата и время изменения')),
+            ],
+            options={
+                'verbose_name': 'Версия ресурса',
+                'verbose_name_plural': 'Версии ресурсов',
+            },
+        ),
+    ]
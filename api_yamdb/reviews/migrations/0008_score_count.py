@@ -0,0 +1,52 @@
+# Generated by Django 3.2 on 2026-10-18 18:20
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_score_counts(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreCount = apps.get_model('reviews', 'ScoreCount')
+    counts = (
+        Review.objects.order_by()
+        .values('title', 'score')
+        .annotate(count=Count('id'))
+    )
+    ScoreCount.objects.bulk_create(
+        (
+            ScoreCount(
+                title_id=row['title'], score=row['score'], count=row['count']
+            )
+            for row in counts.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0007_resource_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.PositiveSmallIntegerField(verbose_name='Оценка')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='score_counts', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Распределение оценок',
+                'verbose_name_plural': 'Распределения оценок',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scorecount',
+            constraint=models.UniqueConstraint(fields=('title', 'score'), name='unique_title_score'),
+        ),
+        migrations.RunPython(fill_score_counts, migrations.RunPython.noop),
+    ]
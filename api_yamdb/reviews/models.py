@@ -2,11 +2,14 @@ from django.core.validators import (
     MaxValueValidator,
     MinValueValidator
 )
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F
+from django.utils import timezone
 
 from core.constants import (
     LENG_CUT,
     LENG_MAX,
+    LENG_PATH,
     MAX_SCORE,
     MIN_SCORE,
     RATING_DEFAULT_VALUE
@@ -91,16 +94,13 @@ class Title(models.Model):
     name = models.CharField(
         'Название',
         max_length=LENG_MAX,
-        db_index=True,
     )
     year = models.SmallIntegerField(
         'Год выпуска',
-        db_index=True,
         validators=(validate_year,),
     )
     description = models.TextField(
         'Описание',
-        db_index=True,
         max_length=LENG_MAX,
         blank=True,
     )
@@ -114,15 +114,43 @@ class Title(models.Model):
         verbose_name='Категория',
         on_delete=models.PROTECT,
         related_name='titles',
+        db_index=False,
+    )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False,
     )
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = (
+            models.Index(
+                fields=('-year', 'id'),
+                name='title_year_id_idx',
+            ),
+            models.Index(
+                fields=('category', '-year', 'id'),
+                name='title_category_year_idx',
+            ),
+        )
 
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        """Средняя оценка произведения или None, если отзывов нет."""
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
 
 class Review(BaseAuthorModel):
     """Модель отзыва произведения."""
@@ -130,11 +158,11 @@ class Review(BaseAuthorModel):
     title = models.ForeignKey(
         Title,
         on_delete=models.CASCADE,
-        verbose_name='Произведение'
+        verbose_name='Произведение',
+        db_index=False,
     )
     score = models.PositiveSmallIntegerField(
         'Оценка',
-        db_index=True,
         validators=(
             MinValueValidator(MIN_SCORE),
             MaxValueValidator(MAX_SCORE)
@@ -149,6 +177,12 @@ class Review(BaseAuthorModel):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         default_related_name = 'reviews'
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', 'id'),
+                name='review_title_pub_date_idx',
+            ),
+        )
         constraints = [
             models.UniqueConstraint(
                 fields=('title', 'author',),
@@ -156,6 +190,42 @@ class Review(BaseAuthorModel):
             )
         ]
 
+    def save(self, *args, **kwargs):
+        # Старая оценка (reviews.signals) читается с блокировкой строки в
+        # той же транзакции, что запись отзыва и изменение рейтинга.
+        using = kwargs.get('using') or router.db_for_write(
+            Review, instance=self
+        )
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+
+
+class ScoreCount(models.Model):
+    """Количество отзывов произведения с данной оценкой."""
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение',
+        related_name='score_counts',
+        db_index=False,
+    )
+    score = models.PositiveSmallIntegerField('Оценка')
+    count = models.PositiveIntegerField('Количество отзывов', default=0)
+
+    class Meta:
+        verbose_name = 'Распределение оценок'
+        verbose_name_plural = 'Распределения оценок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=('title', 'score'),
+                name='unique_title_score',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} × {self.count}'
+
 
 class Comment(BaseAuthorModel):
     """Модель комментария к отзыву."""
@@ -163,10 +233,97 @@ class Comment(BaseAuthorModel):
     review = models.ForeignKey(
         Review,
         on_delete=models.CASCADE,
-        verbose_name='Отзыв'
+        verbose_name='Отзыв',
+        db_index=False,
     )
 
     class Meta(BaseAuthorModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', 'id'),
+                name='comment_review_pub_date_idx',
+            ),
+        )
+
+
+class ImportCheckpoint(models.Model):
+    """Прогресс инкрементального импорта CSV файла."""
+
+    path = models.CharField(
+        'Путь к файлу',
+        max_length=LENG_PATH,
+        unique=True,
+    )
+    size = models.PositiveBigIntegerField('Размер файла')
+    modified = models.FloatField('Время изменения файла')
+    offset = models.PositiveBigIntegerField(
+        'Позиция в файле',
+        default=0,
+    )
+    rows = models.PositiveBigIntegerField(
+        'Загружено строк',
+        default=0,
+    )
+    completed = models.BooleanField(
+        'Загружен полностью',
+        default=False,
+    )
+    updated_at = models.DateTimeField(
+        'Дата и время обновления',
+        auto_now=True,
+    )
+
+    class Meta:
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        return f'{self.path}: {self.rows}'
+
+
+class ResourceVersion(models.Model):
+    """Счётчик изменений ресурса API (titles, genres, categories)."""
+
+    name = models.CharField(
+        'Ресурс',
+        max_length=LENG_CUT,
+        primary_key=True,
+    )
+    version = models.PositiveBigIntegerField(
+        'Версия',
+        default=0,
+    )
+    updated_at = models.DateTimeField(
+        'Дата и время изменения',
+        default=timezone.now,
+    )
+
+    class Meta:
+        verbose_name = 'Версия ресурса'
+        verbose_name_plural = 'Версии ресурсов'
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+    @classmethod
+    def current(cls, name):
+        """Текущая версия ресурса без записи в БД."""
+        return cls.objects.filter(name=name).first() or cls(
+            name=name, updated_at=None
+        )
+
+    @classmethod
+    def bump(cls, *names):
+        """Увеличивает версии ресурсов после изменения их данных."""
+        now = timezone.now()
+        for name in names:
+            updated = cls.objects.filter(name=name).update(
+                version=F('version') + 1, updated_at=now
+            )
+            if not updated:
+                cls.objects.get_or_create(
+                    name=name, defaults={'version': 1, 'updated_at': now}
+                )
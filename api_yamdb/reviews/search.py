@@ -0,0 +1,123 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from core.constants import SEARCH_CONFIG
+from reviews.models import Title
+
+TITLE_TABLE = Title._meta.db_table
+FTS_TABLE = f'{TITLE_TABLE}_fts'
+
+SQLITE_INDEX_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"name, description, content='{TITLE_TABLE}', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT "
+    f"ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE "
+    f"ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE "
+    f"OF name, description ON {TITLE_TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description) "
+    f"VALUES ('delete', old.id, old.name, old.description); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, description) "
+    f"VALUES (new.id, new.name, new.description); END",
+)
+SQLITE_INDEX_NAMES = (
+    FTS_TABLE, f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au'
+)
+SQLITE_REBUILD_SQL = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+POSTGRESQL_INDEX_SQL = (
+    f"ALTER TABLE {TITLE_TABLE} ADD COLUMN IF NOT EXISTS search_vector "
+    f"tsvector GENERATED ALWAYS AS (to_tsvector('{SEARCH_CONFIG}', "
+    f"coalesce(name, '') || ' ' || coalesce(description, ''))) STORED",
+    f"CREATE INDEX IF NOT EXISTS {TITLE_TABLE}_search_idx "
+    f"ON {TITLE_TABLE} USING GIN (search_vector)",
+)
+
+_fts5_support = {}
+
+
+def has_fts5(connection):
+    """Проверяет, собран ли SQLite с модулем FTS5."""
+    if connection.vendor != 'sqlite':
+        return False
+    if connection.alias not in _fts5_support:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            _fts5_support[connection.alias] = bool(cursor.fetchone()[0])
+    return _fts5_support[connection.alias]
+
+
+def install_search_index(using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Создаёт полнотекстовый индекс произведений, если его ещё нет.
+
+    Вызывается после каждого migrate: SQLite пересоздаёт таблицу при
+    изменении полей, и триггеры синхронизации нужно вернуть.
+    """
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            for sql in POSTGRESQL_INDEX_SQL:
+                cursor.execute(sql)
+        return
+    if not has_fts5(connection):
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT count(*) FROM sqlite_master WHERE name IN ({})'.format(
+                ', '.join(['%s'] * len(SQLITE_INDEX_NAMES))
+            ),
+            SQLITE_INDEX_NAMES
+        )
+        installed = cursor.fetchone()[0]
+        for sql in SQLITE_INDEX_SQL:
+            cursor.execute(sql)
+        if installed < len(SQLITE_INDEX_NAMES):
+            cursor.execute(SQLITE_REBUILD_SQL)
+
+
+def search_titles(queryset, query):
+    """
+    Отбирает произведения по словам из query и сортирует по релевантности.
+
+    Каждое слово ищется как префикс. Без полнотекстового индекса
+    используется поиск подстроки в названии и описании.
+    """
+    words = re.findall(r'\w+', query)
+    if not words:
+        return queryset.none()
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f"'{word}':*" for word in words)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT id FROM {TITLE_TABLE} '
+            f'WHERE search_vector @@ to_tsquery(%s, %s)',
+            (SEARCH_CONFIG, tsquery),
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank({TITLE_TABLE}.search_vector, to_tsquery(%s, %s))',
+            (SEARCH_CONFIG, tsquery),
+            output_field=FloatField(),
+        )).order_by('-search_rank', 'id')
+    if has_fts5(connection):
+        match = ' '.join(f'"{word}"*' for word in words)
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,),
+        )).annotate(search_rank=RawSQL(
+            f'SELECT -rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+            f'AND rowid = {TITLE_TABLE}.id',
+            (match,),
+            output_field=FloatField(),
+        )).order_by('-search_rank', 'id')
+    condition = Q()
+    for word in words:
+        condition &= Q(name__icontains=word) | Q(description__icontains=word)
+    return queryset.filter(condition)
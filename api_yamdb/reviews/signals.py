@@ -0,0 +1,112 @@
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_save
+)
+from django.dispatch import receiver
+
+from reviews.models import (
+    Category,
+    Genre,
+    ResourceVersion,
+    Review,
+    ScoreCount,
+    Title
+)
+
+# Какие ресурсы API меняются при изменении модели: жанры, категории и
+# рейтинг входят в представление произведения.
+CHANGED_RESOURCES = {
+    Title: ('titles',),
+    Review: ('titles',),
+    Genre: ('genres', 'titles'),
+    Category: ('categories', 'titles'),
+}
+
+
+def update_title_rating(title_id, score_delta, count_delta=0):
+    """Атомарно изменяет сумму и количество оценок произведения."""
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score_delta,
+        rating_count=F('rating_count') + count_delta,
+    )
+
+
+def update_score_count(title_id, score, delta):
+    """Атомарно изменяет число отзывов произведения с оценкой score."""
+    updated = ScoreCount.objects.filter(title_id=title_id, score=score).update(
+        count=F('count') + delta
+    )
+    # Строки нет и при удалении отзывов вместе с произведением.
+    if updated or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreCount.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        # Строку успел создать параллельный запрос.
+        update_score_count(title_id, score, delta)
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, using, **kwargs):
+    """
+    Запоминает оценку, сохранённую в БД до изменения отзыва.
+
+    Строка блокируется до конца транзакции Review.save(), чтобы
+    параллельное изменение отзыва не прочитало ту же старую оценку.
+    """
+    instance._previous_score = None
+    if instance.pk is None or instance._state.adding:
+        return
+    reviews = Review.objects.using(using).filter(pk=instance.pk)
+    if connections[using].features.has_select_for_update:
+        reviews = reviews.select_for_update()
+    else:
+        # SQLite без SELECT ... FOR UPDATE: транзакция получает блокировку
+        # записи только с первым изменением, поэтому оно идёт до чтения.
+        reviews.update(score=F('score'))
+    instance._previous_score = reviews.values_list(
+        'score', flat=True
+    ).first()
+
+
+@receiver(post_save, sender=Review)
+def add_review_score(sender, instance, created, **kwargs):
+    """Учитывает новую или изменённую оценку в рейтинге произведения."""
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+        update_score_count(instance.title_id, instance.score, 1)
+        return
+    previous_score = getattr(instance, '_previous_score', None)
+    if previous_score is not None and previous_score != instance.score:
+        update_title_rating(instance.title_id, instance.score - previous_score)
+        update_score_count(instance.title_id, previous_score, -1)
+        update_score_count(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def remove_review_score(sender, instance, **kwargs):
+    """Исключает оценку удалённого отзыва из рейтинга произведения."""
+    update_title_rating(instance.title_id, -instance.score, -1)
+    update_score_count(instance.title_id, instance.score, -1)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_resource_version(sender, **kwargs):
+    """Меняет версию ресурсов, в которые входит изменённый объект."""
+    if sender in CHANGED_RESOURCES:
+        ResourceVersion.bump(*CHANGED_RESOURCES[sender])
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def bump_title_version(sender, action, **kwargs):
+    """Меняет версию произведений при изменении их жанров."""
+    if action.startswith('post_'):
+        ResourceVersion.bump('titles')
@@ -2,7 +2,7 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 
 from core.constants import ADDITIONAL_USER_FIElDS
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -11,3 +11,12 @@ class AdminUser(BaseUserAdmin):
 
     add_fieldsets = BaseUserAdmin.add_fieldsets + ADDITIONAL_USER_FIElDS
     fieldsets = BaseUserAdmin.fieldsets + ADDITIONAL_USER_FIElDS
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'subject', 'send_after', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at',)
+    search_fields = ('recipient',)
@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import User
+
+USER_STATE_FIELDS = ('id', 'username', 'role', 'is_superuser', 'is_active')
+USER_CLAIMS = ('username', 'role', 'is_superuser')
+USER_CHANGED_KEY = 'users:changed:{}'
+# Бэкенды, метки в которых не видны другим процессам.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# user_id -> (истекает, время последнего изменения, состояние из БД или None)
+# в порядке последнего обращения, не больше USER_STATE_CACHE_SIZE записей.
+_user_states = OrderedDict()
+_user_states_lock = threading.Lock()
+
+
+class RoleAccessToken(AccessToken):
+    """Access-токен с ролью пользователя в утверждениях."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in USER_CLAIMS:
+            token[claim] = getattr(user, claim)
+        return token
+
+
+def get_stamp_timeout():
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def invalidate_users(user_ids):
+    """
+    Помечает утверждения ранее выданных токенов пользователей устаревшими.
+
+    Метка хранится в кэше Django (для нескольких процессов нужен общий
+    бэкенд), локальная запись сбрасывается сразу, в остальных процессах —
+    по истечении USER_STATE_CACHE_TTL.
+    """
+    changed_at = time.time()
+    cache.set_many(
+        {USER_CHANGED_KEY.format(user_id): changed_at
+         for user_id in user_ids},
+        timeout=get_stamp_timeout(),
+    )
+    with _user_states_lock:
+        for user_id in user_ids:
+            _user_states.pop(user_id, None)
+
+
+def invalidate_user(user_id):
+    invalidate_users([user_id])
+
+
+def remember_user_state(user_id, entry):
+    with _user_states_lock:
+        _user_states[user_id] = entry
+        _user_states.move_to_end(user_id)
+        while len(_user_states) > settings.USER_STATE_CACHE_SIZE:
+            _user_states.popitem(last=False)
+
+
+def get_changed_at(user_id):
+    """
+    Время последнего изменения пользователя по метке в кэше.
+
+    Кэш может вытеснить метку, и тогда неизвестно, менялся ли
+    пользователь. Вместо неё ставится метка с текущим временем: все
+    выданные раньше токены проверяются по БД.
+    """
+    key = USER_CHANGED_KEY.format(user_id)
+    changed_at = cache.get(key)
+    if changed_at is None:
+        now = time.time()
+        cache.add(key, now, timeout=get_stamp_timeout())
+        changed_at = cache.get(key, now)
+    return changed_at
+
+
+def get_user_state(user_id, token):
+    """Возвращает поля пользователя из токена или, если они устарели, из БД."""
+    now = time.monotonic()
+    expires, changed_at, state = _user_states.get(user_id, (0, 0, None))
+    if expires <= now:
+        changed_at = get_changed_at(user_id)
+        state = None
+        remember_user_state(
+            user_id, (now + settings.USER_STATE_CACHE_TTL, changed_at, state)
+        )
+    if (
+        all(claim in token for claim in USER_CLAIMS)
+        and token.get('iat', 0) > changed_at
+    ):
+        return {
+            'id': user_id,
+            'is_active': True,
+            **{claim: token[claim] for claim in USER_CLAIMS},
+        }
+    if state is None:
+        state = User.objects.filter(pk=user_id).values(
+            *USER_STATE_FIELDS
+        ).first()
+        remember_user_state(
+            user_id, (now + settings.USER_STATE_CACHE_TTL, changed_at, state)
+        )
+    return state
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT-аутентификация без запроса пользователя к БД.
+
+    Пользователь собирается из утверждений RoleAccessToken как объект
+    User с отложенными полями: роль и имя доступны сразу, остальные поля
+    загружаются при первом обращении, а save() сохраняет только
+    загруженные поля.
+
+    Метки изменения пользователей должны быть видны всем процессам,
+    поэтому с локальным для процесса кэшем default класс не работает.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        backend = settings.CACHES[DEFAULT_CACHE_ALIAS]['BACKEND']
+        if backend in PROCESS_LOCAL_CACHE_BACKENDS:
+            raise ImproperlyConfigured(
+                'CachedJWTAuthentication требует общего для процессов '
+                f'кэша default, а настроен {backend}.'
+            )
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Токен не содержит идентификатор пользователя.'
+            )
+        state = get_user_state(user_id, validated_token)
+        if state is None:
+            raise AuthenticationFailed(
+                'Пользователь не найден.', code='user_not_found'
+            )
+        if not state['is_active']:
+            raise AuthenticationFailed(
+                'Пользователь неактивен.', code='user_inactive'
+            )
+        field_names = [
+            field.attname for field in User._meta.concrete_fields
+            if field.attname in USER_STATE_FIELDS
+        ]
+        return User.from_db(
+            DEFAULT_DB_ALIAS,
+            field_names,
+            [state[field_name] for field_name in field_names],
+        )
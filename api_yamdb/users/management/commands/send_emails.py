@@ -0,0 +1,132 @@
+import time
+from datetime import timedelta
+
+from django.core.mail import get_connection
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import (
+    EMAIL_BATCH_SIZE,
+    EMAIL_LEASE,
+    EMAIL_MAX_ATTEMPTS,
+    EMAIL_RETRY_DELAY
+)
+from core.utils import build_message
+from users.models import OutgoingEmail
+
+
+class Command(BaseCommand):
+
+    help = 'Отправляет письма из очереди пачками через одно соединение'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EMAIL_BATCH_SIZE,
+            help='Количество писем, отправляемых через одно соединение',
+        )
+        parser.add_argument(
+            '--watch',
+            action='store_true',
+            help='Не завершаться, а ждать новые письма',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Пауза в секундах между проверками очереди в режиме --watch',
+        )
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        while True:
+            batch_sent, batch_failed = self.send_batch(options['batch_size'])
+            sent += batch_sent
+            failed += batch_failed
+            if batch_sent or batch_failed:
+                continue
+            if not options['watch']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Отправлено писем: {sent}, отложено после ошибки: {failed}'
+        ))
+
+    def send_batch(self, batch_size):
+        """
+        Отправляет одну пачку писем, которым подошло время.
+
+        Письма забираются и результаты записываются короткими
+        транзакциями, а отправка идёт вне транзакции: долгая транзакция
+        держала бы блокировки на время работы SMTP, а в SQLite запись
+        после чтения в ней может сразу завершиться ошибкой блокировки.
+        """
+        now = timezone.now()
+        emails = self.claim(batch_size, now)
+        if not emails:
+            return 0, 0
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as error:
+            for email in emails:
+                self.postpone(email, error, now)
+        else:
+            try:
+                for email in emails:
+                    self.send(email, connection, now)
+            finally:
+                connection.close()
+        with transaction.atomic():
+            OutgoingEmail.objects.bulk_update(
+                emails, ('sent_at', 'attempts', 'send_after', 'last_error')
+            )
+        sent = sum(email.sent_at is not None for email in emails)
+        return sent, len(emails) - sent
+
+    @staticmethod
+    def claim(batch_size, now):
+        """
+        Забирает письма в отправку на EMAIL_LEASE секунд.
+
+        Каждое письмо забирается условным UPDATE по прочитанному
+        send_after, поэтому письмо, которое успел забрать другой
+        обработчик, пропускается. Если обработчик завершится, не записав
+        результат, письмо снова попадёт в очередь после аренды.
+        """
+        emails = list(
+            OutgoingEmail.objects.filter(
+                sent_at__isnull=True,
+                send_after__lte=now,
+                attempts__lt=EMAIL_MAX_ATTEMPTS,
+            ).order_by('send_after')[:batch_size]
+        )
+        lease = now + timedelta(seconds=EMAIL_LEASE)
+        claimed = []
+        with transaction.atomic():
+            for email in emails:
+                if OutgoingEmail.objects.filter(
+                    pk=email.pk, send_after=email.send_after
+                ).update(send_after=lease):
+                    email.send_after = lease
+                    claimed.append(email)
+        return claimed
+
+    def send(self, email, connection, now):
+        try:
+            build_message(email, connection).send()
+        except Exception as error:
+            self.postpone(email, error, now)
+        else:
+            email.sent_at = now
+
+    @staticmethod
+    def postpone(email, error, now):
+        """Откладывает письмо с экспоненциально растущей задержкой."""
+        email.attempts += 1
+        email.last_error = str(error)
+        email.send_after = now + timedelta(
+            seconds=EMAIL_RETRY_DELAY * 2 ** (email.attempts - 1)
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 3.2 on 2026-10-18 18:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_auto_20241212_2029'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutgoingEmail',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('recipient', models.EmailField(max_length=254, verbose_name='Получатель')),
+                ('subject', models.CharField(max_length=256, verbose_name='Тема')),
+                ('body', models.TextField(verbose_name='Текст')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата и время создания')),
+                ('send_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Отправить не раньше')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Неудачных попыток')),
+                ('sent_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата и время отправки')),
+                ('last_error', models.TextField(blank=True, verbose_name='Последняя ошибка')),
+            ],
+            options={
+                'verbose_name': 'Исходящее письмо',
+                'verbose_name_plural': 'Исходящие письма',
+                'ordering': ('send_after',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='outgoingemail',
+            index=models.Index(condition=models.Q(sent_at__isnull=True), fields=['send_after'], name='outgoing_email_pending_idx'),
+        ),
+    ]
@@ -1,9 +1,11 @@
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 
 from core.constants import (
     FORBIDDEN_SIMBOLS_REGEX,
+    LENG_MAX,
     MAX_LENGTH_EMAIL,
     MAX_LENGTH_USERNAME,
     USER_ROLES
@@ -63,3 +65,53 @@ class User(AbstractUser):
     @property
     def is_admin(self):
         return self.role == ADMIN or self.is_superuser
+
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди на отправку."""
+
+    recipient = models.EmailField(
+        verbose_name='Получатель',
+        max_length=MAX_LENGTH_EMAIL,
+    )
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=LENG_MAX,
+    )
+    body = models.TextField(verbose_name='Текст')
+    created_at = models.DateTimeField(
+        verbose_name='Дата и время создания',
+        auto_now_add=True,
+    )
+    send_after = models.DateTimeField(
+        verbose_name='Отправить не раньше',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Неудачных попыток',
+        default=0,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата и время отправки',
+        null=True,
+        blank=True,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+        ordering = ('send_after',)
+        indexes = (
+            models.Index(
+                fields=('send_after',),
+                condition=models.Q(sent_at__isnull=True),
+                name='outgoing_email_pending_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.recipient}: {self.subject}'
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_claims(sender, instance, **kwargs):
+    """Сбрасывает закэшированные роль и права изменённого пользователя."""
+    invalidate_user(instance.pk)
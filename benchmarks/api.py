@@ -0,0 +1,362 @@
+"""
+Нагрузочный замер основных эндпоинтов API на синтетических данных.
+
+Данные генерируются с перекосом: популярные произведения получают
+больше отзывов, популярные отзывы — больше комментариев. Запросы идут
+последовательно через тестовый клиент Django в одном процессе.
+
+Запуск из корня репозитория:
+    python -m benchmarks.api --titles 5000 --requests 500 --output run.json
+    python -m benchmarks.api --compare run.json --output new.json
+"""
+import argparse
+import json
+import platform
+import random
+import time
+from datetime import datetime, timezone
+from io import StringIO
+
+from benchmarks.utils import percentile, setup_django
+
+BATCH_SIZE = 500
+SCENARIOS = (
+    'titles_list',
+    'titles_filtered',
+    'reviews_list',
+    'comments_list',
+    'review_create',
+    'signup',
+    'token',
+)
+
+
+def zipf_weights(count, skew):
+    """Веса элементов по закону Ципфа: первый самый популярный."""
+    return [1 / (rank ** skew) for rank in range(1, count + 1)]
+
+
+def skewed_counts(count, total, skew, limit):
+    """Раскладывает total по count элементам с перекосом, не больше limit."""
+    weights = zipf_weights(count, skew)
+    scale = total / sum(weights)
+    return [min(limit, round(weight * scale)) for weight in weights]
+
+
+def seed(options):
+    """Заполняет базу и возвращает данные для построения запросов."""
+    from django.core.management import call_command
+
+    from reviews.models import (
+        Category,
+        Comment,
+        Genre,
+        ResourceVersion,
+        Review,
+        Title
+    )
+    from users.models import User
+
+    User.objects.bulk_create((
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(options.users)
+    ), batch_size=BATCH_SIZE)
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(options.categories)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(options.genres)
+    )
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+    category_ids = list(
+        Category.objects.order_by('id').values_list('id', flat=True)
+    )
+    genre_ids = list(Genre.objects.order_by('id').values_list('id', flat=True))
+    category_weights = zipf_weights(len(category_ids), options.skew)
+    genre_weights = zipf_weights(len(genre_ids), options.skew)
+
+    Title.objects.bulk_create((
+        Title(
+            name=f'Произведение {i}',
+            description=f'Описание произведения {i}.',
+            year=random.randint(1900, 2023),
+            category_id=random.choices(category_ids, category_weights)[0],
+        )
+        for i in range(options.titles)
+    ), batch_size=BATCH_SIZE)
+    title_ids = list(Title.objects.order_by('id').values_list('id', flat=True))
+    Title.genre.through.objects.bulk_create((
+        Title.genre.through(title_id=title_id, genre_id=genre_id)
+        for title_id in title_ids
+        for genre_id in set(random.choices(
+            genre_ids, genre_weights, k=random.randint(1, 3)
+        ))
+    ), batch_size=BATCH_SIZE)
+
+    # Последние пользователи не пишут отзывов: каждый создаёт один отзыв
+    # в сценарии review_create.
+    reserved = options.requests + options.warmup
+    writers = user_ids[-reserved:]
+    authors = user_ids[:-reserved]
+    review_counts = skewed_counts(
+        len(title_ids), options.titles * options.reviews_per_title,
+        options.skew, len(authors)
+    )
+    Review.objects.bulk_create((
+        Review(
+            title_id=title_id,
+            author_id=author_id,
+            text='Отзыв',
+            score=random.randint(1, 10),
+        )
+        for title_id, count in zip(title_ids, review_counts)
+        for author_id in random.sample(authors, count)
+    ), batch_size=BATCH_SIZE)
+    reviews = list(
+        Review.objects.order_by('id').values_list('id', 'title_id')
+    )
+    random.shuffle(reviews)
+    comment_counts = skewed_counts(
+        len(reviews), len(reviews) * options.comments_per_review,
+        options.skew, len(reviews)
+    )
+    Comment.objects.bulk_create((
+        Comment(
+            review_id=review_id,
+            author_id=random.choice(user_ids),
+            text='Комментарий',
+        )
+        for (review_id, _), count in zip(reviews, comment_counts)
+        for _ in range(count)
+    ), batch_size=BATCH_SIZE)
+
+    # bulk_create не вызывает сигналы: рейтинг и версии ресурсов
+    # обновляются отдельно.
+    call_command('recalculate_ratings', stdout=StringIO())
+    ResourceVersion.bump('genres', 'categories')
+    return {
+        'title_ids': title_ids,
+        'title_weights': zipf_weights(len(title_ids), options.skew),
+        'reviews': reviews,
+        'review_weights': zipf_weights(len(reviews), options.skew),
+        'category_slugs': [f'category-{i}' for i in range(options.categories)],
+        'genre_slugs': [f'genre-{i}' for i in range(options.genres)],
+        'writers': writers,
+        'user_ids': authors,
+    }
+
+
+class Driver:
+    """Строит запросы сценариев по сгенерированным данным."""
+
+    def __init__(self, data, options):
+        from django.test import Client
+
+        from users.authentication import RoleAccessToken
+        from users.models import User
+
+        self.data = data
+        self.client = Client()
+        self.read_headers = {}
+        if options.authenticated_reads:
+            reader = User.objects.get(pk=data['user_ids'][0])
+            self.read_headers = {
+                'HTTP_AUTHORIZATION':
+                    f'Bearer {RoleAccessToken.for_user(reader)}'
+            }
+        self.writers = iter(User.objects.filter(pk__in=data['writers']))
+        self.token_users = list(User.objects.filter(
+            pk__in=random.sample(
+                data['user_ids'], min(len(data['user_ids']), 50)
+            )
+        ))
+        self.signups = 0
+        self.token_class = RoleAccessToken
+
+    def pick_title(self):
+        return random.choices(
+            self.data['title_ids'], self.data['title_weights']
+        )[0]
+
+    def titles_list(self):
+        return self.client.get('/api/v1/titles/', **self.read_headers)
+
+    def titles_filtered(self):
+        params = random.choice((
+            {'category': random.choice(self.data['category_slugs'])},
+            {'genre': random.choice(self.data['genre_slugs'])},
+            {'year': random.randint(1900, 2023)},
+            {'name': str(random.randint(1, 99))},
+        ))
+        return self.client.get(
+            '/api/v1/titles/', params, **self.read_headers
+        )
+
+    def reviews_list(self):
+        return self.client.get(
+            f'/api/v1/titles/{self.pick_title()}/reviews/',
+            **self.read_headers
+        )
+
+    def comments_list(self):
+        review_id, title_id = random.choices(
+            self.data['reviews'], self.data['review_weights']
+        )[0]
+        return self.client.get(
+            f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/',
+            **self.read_headers
+        )
+
+    def review_create(self):
+        writer = next(self.writers)
+        return self.client.post(
+            f'/api/v1/titles/{self.pick_title()}/reviews/',
+            {'text': 'Отзыв из замера', 'score': random.randint(1, 10)},
+            HTTP_AUTHORIZATION=f'Bearer {self.token_class.for_user(writer)}',
+        )
+
+    def signup(self):
+        self.signups += 1
+        return self.client.post('/api/v1/auth/signup/', {
+            'username': f'bench{self.signups}',
+            'email': f'bench{self.signups}@yamdb.fake',
+        })
+
+    def token(self):
+        from django.contrib.auth.tokens import default_token_generator
+
+        user = random.choice(self.token_users)
+        return self.client.post('/api/v1/auth/token/', {
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+
+
+def run_scenario(driver, name, requests, warmup):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    request = getattr(driver, name)
+    for _ in range(warmup):
+        request()
+    latencies = []
+    queries = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = request()
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries.append(len(context.captured_queries))
+        if response.status_code >= 400:
+            errors += 1
+    elapsed = time.perf_counter() - started
+    return {
+        'requests': requests,
+        'errors': errors,
+        'p50_ms': percentile(latencies, 50),
+        'p95_ms': percentile(latencies, 95),
+        'p99_ms': percentile(latencies, 99),
+        'queries_per_request': sum(queries) / requests,
+        'requests_per_second': requests / elapsed,
+    }
+
+
+def print_report(results, baseline=None):
+    columns = (
+        'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request',
+        'requests_per_second',
+    )
+    print(f'{"сценарий":<18}' + ''.join(f'{column:>22}' for column in columns))
+    for name, result in results.items():
+        cells = []
+        for column in columns:
+            cell = f'{result[column]:.2f}'
+            previous = (baseline or {}).get(name, {}).get(column)
+            if previous:
+                cell += f' ({(result[column] / previous - 1) * 100:+.0f}%)'
+            cells.append(f'{cell:>22}')
+        errors = f'  ошибок: {result["errors"]}' if result['errors'] else ''
+        print(f'{name:<18}' + ''.join(cells) + errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--genres', type=int, default=30)
+    parser.add_argument('--titles', type=int, default=5000)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--comments-per-review', type=int, default=2)
+    parser.add_argument(
+        '--skew', type=float, default=1.1,
+        help='Показатель закона Ципфа для популярности объектов',
+    )
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS
+    )
+    parser.add_argument(
+        '--authenticated-reads', action='store_true',
+        help='Читать с токеном, в обход кэша ответов анонимным',
+    )
+    parser.add_argument('--database', help='Файл SQLite для замера')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON')
+    parser.add_argument('--compare', help='JSON прошлого запуска')
+    options = parser.parse_args()
+    if options.users <= options.requests + options.warmup:
+        parser.error('--users должно быть больше --requests + --warmup')
+
+    random.seed(options.seed)
+    setup_django(options.database)
+    import django
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connection
+
+    settings.ALLOWED_HOSTS = ['*']
+    call_command('migrate', verbosity=0)
+    seed_start = time.perf_counter()
+    data = seed(options)
+    seed_seconds = time.perf_counter() - seed_start
+
+    driver = Driver(data, options)
+    results = {
+        name: run_scenario(driver, name, options.requests, options.warmup)
+        for name in options.scenarios
+    }
+    baseline = None
+    if options.compare:
+        with open(options.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+    print_report(results, baseline)
+
+    report = {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'environment': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'platform': platform.platform(),
+        },
+        'options': {
+            key: value for key, value in vars(options).items()
+            if key not in ('output', 'compare')
+        },
+        'seed_seconds': seed_seconds,
+        'results': results,
+    }
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
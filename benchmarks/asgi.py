@@ -0,0 +1,242 @@
+"""
+Пропускная способность чтения при одновременных соединениях: WSGI и ASGI.
+
+Режимы:
+    wsgi        — обработчик WSGI, по потоку на соединение (как у
+                  многопоточного сервера);
+    asgi        — обработчик ASGI с синхронными представлениями, которые
+                  Django выполняет по одному в общем потоке;
+    asgi-async  — обработчик ASGI с асинхронным чтением
+                  (ASYNC_READS=True, api.v1.async_reads).
+
+Данные генерируются один раз (benchmarks.api.seed), каждый режим
+запускается в отдельном процессе. Запросы — GET списков произведений,
+жанров, категорий, отзывов и комментариев с токеном, в обход кэша
+ответов анонимным.
+
+Запуск из корня репозитория:
+    python -m benchmarks.asgi --concurrency 1 8 32 --requests 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from io import StringIO
+
+from benchmarks.utils import BASE_DIR, percentile, setup_django
+
+MODES = ('wsgi', 'asgi', 'asgi-async')
+
+
+def seed(options):
+    from django.core.management import call_command
+
+    from benchmarks.api import seed as seed_api
+
+    call_command('migrate', verbosity=0, stdout=StringIO())
+    seed_api(argparse.Namespace(
+        users=options.users,
+        categories=10,
+        genres=30,
+        titles=options.titles,
+        reviews_per_title=options.reviews_per_title,
+        comments_per_review=2,
+        skew=1.1,
+        requests=1,
+        warmup=0,
+    ))
+
+
+def build_paths(count):
+    """Пути запросов: популярные объекты запрашиваются чаще."""
+    from benchmarks.api import zipf_weights
+    from reviews.models import Review, Title
+
+    title_ids = list(Title.objects.order_by('id').values_list('id', flat=True))
+    reviews = list(
+        Review.objects.order_by('id').values_list('id', 'title_id')
+    )
+    title_weights = zipf_weights(len(title_ids), 1.1)
+    review_weights = zipf_weights(len(reviews), 1.1)
+    paths = []
+    for _ in range(count):
+        kind = random.choice(
+            ('titles', 'genres', 'categories', 'reviews', 'comments')
+        )
+        if kind == 'reviews':
+            title_id = random.choices(title_ids, title_weights)[0]
+            paths.append(f'/api/v1/titles/{title_id}/reviews/')
+        elif kind == 'comments':
+            review_id, title_id = random.choices(reviews, review_weights)[0]
+            paths.append(
+                f'/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+            )
+        else:
+            paths.append(f'/api/v1/{kind}/')
+    return paths
+
+
+def get_token():
+    from users.authentication import RoleAccessToken
+    from users.models import User
+
+    return str(RoleAccessToken.for_user(User.objects.order_by('id').first()))
+
+
+def run_wsgi(paths, concurrency, token):
+    from django.db import connection
+    from django.test import Client
+
+    queue = iter(paths)
+    lock = threading.Lock()
+    latencies = []
+    errors = []
+
+    def worker():
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        try:
+            while True:
+                with lock:
+                    path = next(queue, None)
+                if path is None:
+                    break
+                start = time.perf_counter()
+                response = client.get(path)
+                latencies.append((time.perf_counter() - start) * 1000)
+                errors.append(response.status_code != 200)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, sum(errors)
+
+
+def run_asgi(paths, concurrency, token):
+    from django.test import AsyncClient
+
+    queue = iter(paths)
+    latencies = []
+    errors = []
+
+    async def worker():
+        client = AsyncClient()
+        for path in queue:
+            start = time.perf_counter()
+            response = await client.get(path, authorization=f'Bearer {token}')
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors.append(response.status_code != 200)
+
+    async def main():
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    asyncio.run(main())
+    return latencies, sum(errors)
+
+
+def run_mode(options):
+    """Замер одного режима в текущем процессе, результат — JSON в stdout."""
+    random.seed(options.seed)
+    setup_django(options.database)
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ['*']
+    token = get_token()
+    run = run_wsgi if options.mode == 'wsgi' else run_asgi
+    run(build_paths(options.warmup), 1, token)
+    results = {}
+    for concurrency in options.concurrency:
+        paths = build_paths(options.requests)
+        start = time.perf_counter()
+        latencies, errors = run(paths, concurrency, token)
+        elapsed = time.perf_counter() - start
+        results[concurrency] = {
+            'requests_per_second': len(latencies) / elapsed,
+            'p50_ms': percentile(latencies, 50),
+            'p95_ms': percentile(latencies, 95),
+            'p99_ms': percentile(latencies, 99),
+            'errors': errors,
+        }
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        '--concurrency', type=int, nargs='+', default=(1, 8, 32),
+        help='Числа одновременных соединений',
+    )
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--reviews-per-title', type=int, default=3)
+    parser.add_argument('--workers', type=int, default=8,
+                        help='ASYNC_READ_WORKERS для asgi-async')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON')
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument('--database', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    if options.mode:
+        run_mode(options)
+        return
+
+    random.seed(options.seed)
+    database = setup_django()
+    seed(options)
+    from django.db import connections
+    connections.close_all()
+
+    results = {}
+    for mode in options.modes:
+        env = {
+            **os.environ,
+            'ASYNC_READS': str(mode == 'asgi-async'),
+            'ASYNC_READ_WORKERS': str(options.workers),
+        }
+        command = [
+            sys.executable, '-m', 'benchmarks.asgi',
+            '--mode', mode,
+            '--database', database,
+            '--requests', str(options.requests),
+            '--warmup', str(options.warmup),
+            '--seed', str(options.seed),
+            '--concurrency', *map(str, options.concurrency),
+        ]
+        output = subprocess.run(
+            command, cwd=BASE_DIR, env=env, check=True,
+            stdout=subprocess.PIPE, universal_newlines=True,
+        ).stdout
+        results[mode] = json.loads(output.splitlines()[-1])
+
+    columns = ('requests_per_second', 'p50_ms', 'p95_ms', 'p99_ms', 'errors')
+    print(f'{"режим":<12}{"соединений":>12}' + ''.join(
+        f'{column:>22}' for column in columns
+    ))
+    for mode, by_concurrency in results.items():
+        for concurrency, result in by_concurrency.items():
+            print(f'{mode:<12}{concurrency:>12}' + ''.join(
+                f'{result[column]:>22.2f}' for column in columns
+            ))
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'options': vars(options), 'results': results},
+                file, indent=2, ensure_ascii=False,
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Замер вставки и чтения до и после миграции reviews 0005_audit_indexes.
+
+Запуск из корня репозитория:
+    python -m benchmarks.indexes --titles 20000 --reviews-per-title 5
+"""
+import argparse
+import json
+import random
+
+from benchmarks.utils import setup_django, timeit
+
+BEFORE = '0004_keyset_indexes'
+AFTER = '0005_audit_indexes'
+BATCH_SIZE = 500
+
+
+def seed(options):
+    from reviews.models import Category, Comment, Genre, Review, Title
+    from users.models import User
+
+    User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(options.users)
+    )
+    Category.objects.bulk_create(
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(options.categories)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(20)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    timings = {}
+
+    timings['insert_titles'] = timeit(lambda: Title.objects.bulk_create((
+        Title(
+            name=f'Произведение {i}',
+            description=f'Описание произведения {i}. ' * 8,
+            year=random.randint(1900, 2020),
+            category_id=random.choice(category_ids),
+        )
+        for i in range(options.titles)
+    ), batch_size=BATCH_SIZE))
+    title_ids = list(Title.objects.values_list('id', flat=True))
+
+    timings['insert_reviews'] = timeit(lambda: Review.objects.bulk_create((
+        Review(
+            title_id=title_id,
+            author_id=author_id,
+            text='Отзыв',
+            score=random.randint(1, 10),
+        )
+        for title_id in title_ids
+        for author_id in random.sample(user_ids, options.reviews_per_title)
+    ), batch_size=BATCH_SIZE))
+    review_ids = list(Review.objects.values_list('id', flat=True))
+
+    timings['insert_comments'] = timeit(lambda: Comment.objects.bulk_create((
+        Comment(
+            review_id=random.choice(review_ids),
+            author_id=random.choice(user_ids),
+            text='Комментарий',
+        )
+        for _ in range(options.comments)
+    ), batch_size=BATCH_SIZE))
+    return timings, category_ids, title_ids, review_ids
+
+
+def read(options, category_ids, title_ids, review_ids):
+    from reviews.models import Comment, Review, Title
+
+    queries = {
+        'titles_by_category': lambda: list(Title.objects.filter(
+            category_id=random.choice(category_ids)
+        ).order_by('-year', 'id')[:10]),
+        'titles_by_year': lambda: list(Title.objects.filter(
+            year=random.randint(1900, 2020)
+        ).order_by('-year', 'id')[:10]),
+        'category_protect_check': lambda: Title.objects.filter(
+            category_id=random.choice(category_ids)
+        ).exists(),
+        'reviews_by_title': lambda: list(Review.objects.filter(
+            title_id=random.choice(title_ids)
+        ).order_by('-pub_date', 'id')[:10]),
+        'comments_by_review': lambda: list(Comment.objects.filter(
+            review_id=random.choice(review_ids)
+        ).order_by('-pub_date', 'id')[:10]),
+    }
+    return {
+        name: timeit(query, repeat=options.repeat)
+        for name, query in queries.items()
+    }
+
+
+def database_size():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        pragmas = {}
+        for pragma in ('page_size', 'page_count', 'freelist_count'):
+            cursor.execute(f'PRAGMA {pragma}')
+            pragmas[pragma] = cursor.fetchone()[0]
+    return pragmas['page_size'] * (
+        pragmas['page_count'] - pragmas['freelist_count']
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=20000)
+    parser.add_argument('--reviews-per-title', type=int, default=5)
+    parser.add_argument('--comments', type=int, default=50000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+    results = {}
+    for label, migration in (('before', BEFORE), ('after', AFTER)):
+        random.seed(options.seed)
+        call_command('migrate', 'reviews', migration, verbosity=0)
+        timings, *ids = seed(options)
+        timings.update(read(options, *ids))
+        timings['db_size_kb'] = database_size() // 1024
+        results[label] = timings
+        call_command('flush', interactive=False, verbosity=0)
+
+    print(f'{"метрика, мс":<24}{"before":>12}{"after":>12}')
+    for name in results['before']:
+        print(
+            f'{name:<24}{results["before"][name]:>12.3f}'
+            f'{results["after"][name]:>12.3f}'
+        )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
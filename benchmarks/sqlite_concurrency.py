@@ -0,0 +1,215 @@
+"""
+Пропускная способность чтения SQLite при активной записи.
+
+Для профилей настроек соединения (default — без PRAGMA, tuned —
+settings.SQLITE_PRAGMAS) потоки-читатели запрашивают /api/v1/titles/,
+сначала без записи, затем вместе с потоком, непрерывно создающим
+отзывы.
+
+Запуск из корня репозитория:
+    python -m benchmarks.sqlite_concurrency --readers 4 --duration 5
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+
+from benchmarks.utils import percentile, setup_django
+
+BATCH_SIZE = 500
+
+
+def seed(options):
+    from reviews.models import Category, Genre, ResourceVersion, Title
+    from users.models import User
+
+    User.objects.bulk_create((
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(options.users)
+    ), batch_size=BATCH_SIZE)
+    category = Category.objects.create(name='Фильм', slug='film')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    Title.objects.bulk_create((
+        Title(
+            name=f'Произведение {i}',
+            year=random.randint(1900, 2023),
+            category=category,
+        )
+        for i in range(options.titles)
+    ), batch_size=BATCH_SIZE)
+    Title.genre.through.objects.bulk_create((
+        Title.genre.through(title_id=title_id, genre=genre)
+        for title_id in Title.objects.values_list('id', flat=True)
+    ), batch_size=BATCH_SIZE)
+    ResourceVersion.bump('titles', 'genres', 'categories')
+
+
+def reader(token, pages, stop, results):
+    from django.db import connection
+    from django.test import Client
+
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+    latencies = []
+    errors = 0
+    try:
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                response = client.get(
+                    '/api/v1/titles/', {'page': random.randint(1, pages)}
+                )
+                failed = response.status_code != 200
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+    finally:
+        connection.close()
+    results.append((latencies, errors))
+
+
+def writer(pairs, interval, stop, counters):
+    from django.db import connection, transaction
+
+    from reviews.models import Review
+
+    try:
+        for title_id, author_id in pairs:
+            if stop.is_set():
+                break
+            try:
+                with transaction.atomic():
+                    Review.objects.create(
+                        title_id=title_id,
+                        author_id=author_id,
+                        text='Отзыв',
+                        score=random.randint(1, 10),
+                    )
+                counters['writes'] += 1
+            except Exception:
+                counters['errors'] += 1
+            if interval:
+                time.sleep(interval)
+    finally:
+        connection.close()
+
+
+def run_phase(options, token, with_writer, pairs):
+    stop = threading.Event()
+    results = []
+    counters = {'writes': 0, 'errors': 0}
+    threads = [
+        threading.Thread(
+            target=reader,
+            args=(token, options.titles // 10, stop, results),
+        )
+        for _ in range(options.readers)
+    ]
+    if with_writer:
+        threads.append(threading.Thread(
+            target=writer,
+            args=(pairs, options.write_interval, stop, counters),
+        ))
+    for thread in threads:
+        thread.start()
+    time.sleep(options.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    latencies = [value for values, _ in results for value in values]
+    return {
+        'reads_per_second': len(latencies) / options.duration,
+        'read_p50_ms': percentile(latencies, 50),
+        'read_p95_ms': percentile(latencies, 95),
+        'read_p99_ms': percentile(latencies, 99),
+        'read_errors': sum(errors for _, errors in results),
+        'writes_per_second': counters['writes'] / options.duration,
+        'write_errors': counters['errors'],
+    }
+
+
+def run_profile(options, pragmas):
+    from django.conf import settings
+    from django.core.management import call_command
+    from django.db import connections
+
+    from reviews.models import Title
+    from users.authentication import RoleAccessToken
+    from users.models import User
+
+    connections.close_all()
+    database = settings.DATABASES['default']
+    database['NAME'] = os.path.join(
+        tempfile.mkdtemp(prefix='yamdb-bench-'), 'db.sqlite3'
+    )
+    database['OPTIONS']['pragmas'] = pragmas
+    call_command('migrate', verbosity=0)
+    seed(options)
+    token = str(RoleAccessToken.for_user(User.objects.first()))
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    user_ids = list(User.objects.values_list('id', flat=True))
+    pairs = iter([
+        (title_id, author_id)
+        for title_id in title_ids
+        for author_id in user_ids
+    ])
+    connections.close_all()
+    return {
+        'idle': run_phase(options, token, False, pairs),
+        'writing': run_phase(options, token, True, pairs),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--titles', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument(
+        '--write-interval', type=float, default=0,
+        help='Пауза писателя между транзакциями, с',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Файл для результатов в JSON')
+    options = parser.parse_args()
+
+    random.seed(options.seed)
+    setup_django()
+    from django.conf import settings
+
+    settings.ALLOWED_HOSTS = ['*']
+    profiles = {'default': {}, 'tuned': dict(settings.SQLITE_PRAGMAS)}
+    results = {
+        name: run_profile(options, pragmas)
+        for name, pragmas in profiles.items()
+    }
+
+    columns = (
+        'reads_per_second', 'read_p50_ms', 'read_p95_ms', 'read_p99_ms',
+        'read_errors', 'writes_per_second', 'write_errors',
+    )
+    print(f'{"профиль":<18}' + ''.join(
+        f'{column:>19}' for column in columns
+    ))
+    for name, phases in results.items():
+        for phase, result in phases.items():
+            print(f'{f"{name}/{phase}":<18}' + ''.join(
+                f'{result[column]:>19.2f}' for column in columns
+            ))
+    if options.output:
+        with open(options.output, 'w', encoding='utf-8') as file:
+            json.dump(
+                {'options': vars(options), 'profiles': profiles,
+                 'results': results},
+                file, indent=2, ensure_ascii=False,
+            )
+
+
+if __name__ == '__main__':
+    main()
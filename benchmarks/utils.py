@@ -0,0 +1,47 @@
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = BASE_DIR / 'api_yamdb'
+
+
+def setup_django(database_name=None):
+    """
+    Настраивает Django на отдельную базу для замеров.
+
+    Без database_name создаётся временный файл SQLite, рабочая база
+    проекта не затрагивается.
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    if database_name is None:
+        database_name = os.path.join(
+            tempfile.mkdtemp(prefix='yamdb-bench-'), 'db.sqlite3'
+        )
+    import django
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database_name
+    django.setup()
+    return database_name
+
+
+def timeit(func, repeat=1):
+    """Возвращает медиану времени выполнения func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def percentile(values, percent):
+    """Перцентиль percent (0–100) методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * percent // 100))
+    return ordered[int(rank) - 1]
@@ -0,0 +1,20 @@
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.fixture
+def category():
+    return Category.objects.create(name='Фильм', slug='film')
+
+
+@pytest.fixture
+def genre():
+    return Genre.objects.create(name='Драма', slug='drama')
+
+
+@pytest.fixture
+def title(category, genre):
+    title = Title.objects.create(name='Титаник', year=1997, category=category)
+    title.genre.add(genre)
+    return title
@@ -0,0 +1,83 @@
+import sqlite3
+from contextlib import closing
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import pre_save
+
+from reviews.models import Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_reviews(self, title, user, moderator, admin):
+        review = Review.objects.create(
+            title=title, author=user, text='text', score=4
+        )
+        Review.objects.create(
+            title=title, author=moderator, text='text', score=8
+        )
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (12, 2)
+        assert title.rating == 6
+
+        review.score = 10
+        review.save()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (18, 2)
+
+        review.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (8, 1)
+
+        moderator.delete()
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (0, 0)
+        assert title.rating is None
+
+    def test_02_recalculate_ratings(self, title, user, admin):
+        Review.objects.bulk_create([
+            Review(title=title, author=user, text='text', score=3),
+            Review(title=title, author=admin, text='text', score=6),
+        ])
+        title.refresh_from_db()
+        assert title.rating_count == 0
+
+        call_command('recalculate_ratings')
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (9, 2)
+
+    def test_03_previous_score_locked(self, title, user):
+        review = Review.objects.create(
+            title=title, author=user, text='text', score=4
+        )
+        errors = []
+
+        def concurrent_update(sender, instance, **kwargs):
+            # Второе соединение с той же базой, как параллельный запрос.
+            with closing(sqlite3.connect(
+                connection.settings_dict['NAME'], uri=True, timeout=0
+            )) as other:
+                try:
+                    other.execute(
+                        f'UPDATE {Review._meta.db_table} SET score = 9 '
+                        'WHERE id = ?', (review.pk,)
+                    )
+                    other.commit()
+                except sqlite3.OperationalError as error:
+                    errors.append(error)
+
+        pre_save.connect(concurrent_update, sender=Review)
+        try:
+            review.score = 10
+            review.save()
+        finally:
+            pre_save.disconnect(concurrent_update, sender=Review)
+
+        assert errors, 'Строка отзыва не заблокирована до чтения оценки'
+        title.refresh_from_db()
+        assert (title.rating_sum, title.rating_count) == (10, 1)
+        assert title.score_counts.get(score=10).count == 1
+        assert not title.score_counts.filter(score=4, count__gt=0).exists()
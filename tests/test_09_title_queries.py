@@ -0,0 +1,67 @@
+import pytest
+from rest_framework.pagination import PageNumberPagination
+
+from reviews import lookups
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def create_titles(self):
+        def create(count):
+            Category.objects.bulk_create(
+                Category(name=f'Категория {i}', slug=f'category-{i}')
+                for i in range(3)
+            )
+            Genre.objects.bulk_create(
+                Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(5)
+            )
+            categories = list(Category.objects.order_by('id'))
+            genres = list(Genre.objects.order_by('id'))
+            Title.objects.bulk_create(
+                Title(
+                    name=f'Произведение {i}',
+                    year=1900 + i % 100,
+                    category=categories[i % len(categories)],
+                )
+                for i in range(count)
+            )
+            titles = Title.objects.order_by('id')
+            Title.genre.through.objects.bulk_create(
+                Title.genre.through(title=title, genre=genre)
+                for index, title in enumerate(titles)
+                for genre in (genres[index % 5], genres[(index + 1) % 5])
+            )
+        return create
+
+    @pytest.mark.parametrize('page_size', (10, 100, 1000))
+    def test_01_title_list_query_count(
+        self, client, monkeypatch, django_assert_num_queries, create_titles,
+        page_size
+    ):
+        create_titles(page_size)
+        monkeypatch.setattr(PageNumberPagination, 'page_size', page_size)
+        # Жанры и категории загружаются в память процесса один раз,
+        # дальше читаются только их версии.
+        lookups.genres.slugs()
+        lookups.categories.slugs()
+        # Версия ресурса, COUNT, страница, жанры и версии категорий и жанров.
+        with django_assert_num_queries(6):
+            response = client.get(self.TITLES_URL)
+        results = response.json()['results']
+        assert len(results) == page_size
+        assert all(len(title['genre']) == 2 for title in results)
+        assert all(title['category'] for title in results)
+
+    def test_02_title_detail_query_count(
+        self, client, django_assert_num_queries, create_titles
+    ):
+        create_titles(1)
+        title = Title.objects.get()
+        with django_assert_num_queries(3):
+            response = client.get(f'{self.TITLES_URL}{title.id}/')
+        assert len(response.json()['genre']) == 2
@@ -0,0 +1,69 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10KeysetPagination:
+
+    TITLES_URL = '/api/v1/titles/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=1990 + i % 4,
+                  category=category)
+            for i in range(25)
+        )
+        return list(Title.objects.order_by('-year', 'id'))
+
+    def walk(self, client, url):
+        pages = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            assert 'count' not in data
+            pages.append(data)
+            url = data['next']
+        return pages
+
+    def test_01_titles_forward_and_back(self, client, titles):
+        pages = self.walk(client, f'{self.TITLES_URL}?cursor=')
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == [title.id for title in titles]
+        assert [len(page['results']) for page in pages] == [10, 10, 5]
+        assert pages[0]['previous'] is None
+
+        response = client.get(pages[-1]['previous'])
+        assert [item['id'] for item in response.json()['results']] == [
+            item['id'] for item in pages[1]['results']
+        ]
+
+    def test_02_reviews_cursor(self, client, titles, user, admin, moderator):
+        title = titles[0]
+        for author in (user, admin, moderator):
+            Review.objects.create(
+                title=title, author=author, text='text', score=5
+            )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = client.get(f'{url}?cursor=')
+        data = response.json()
+        assert [item['id'] for item in data['results']] == list(
+            title.reviews.order_by('-pub_date', 'id').values_list(
+                'id', flat=True
+            )
+        )
+        assert data['next'] is None
+
+    def test_03_invalid_cursor(self, client, titles):
+        response = client.get(f'{self.TITLES_URL}?cursor=broken')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_page_number_mode_kept(self, client, titles):
+        response = client.get(self.TITLES_URL)
+        assert response.json()['count'] == len(titles)
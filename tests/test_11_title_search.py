@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        return {
+            name: Title.objects.create(
+                name=name, description=description, year=2000,
+                category=category
+            )
+            for name, description in (
+                ('Крестный отец', 'Сага о семье Корлеоне.'),
+                ('Отец солдата', 'Драма о войне.'),
+                ('Бойцовский клуб', 'Клуб, о котором не говорят.'),
+            )
+        }
+
+    def search(self, client, query):
+        response = client.get(self.TITLES_URL, {'search': query})
+        assert response.status_code == HTTPStatus.OK
+        return [title['name'] for title in response.json()['results']]
+
+    def test_01_search_by_name_and_description(self, client, titles):
+        assert set(self.search(client, 'отец')) == {
+            'Крестный отец', 'Отец солдата'
+        }
+        assert self.search(client, 'корлеоне') == ['Крестный отец']
+        assert self.search(client, 'клуб') == ['Бойцовский клуб']
+        assert self.search(client, 'солд') == ['Отец солдата']
+
+    def test_02_search_index_follows_changes(self, client, titles):
+        title = titles['Отец солдата']
+        title.name = 'Баллада о солдате'
+        title.save()
+        assert self.search(client, 'баллада') == ['Баллада о солдате']
+        assert self.search(client, 'отец') == ['Крестный отец']
+
+        title.delete()
+        assert self.search(client, 'солдате') == []
+
+    def test_03_search_syntax_is_escaped(self, client, titles):
+        assert self.search(client, '"клуб*" (') == ['Бойцовский клуб']
+        assert self.search(client, '!!!') == []
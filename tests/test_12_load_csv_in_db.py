@@ -0,0 +1,130 @@
+import csv
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+from contextlib import closing
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands.load_csv_in_db import FILE_DIR, TABLES
+from reviews.models import Review, Title
+
+MANAGE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api_yamdb'
+)
+
+
+def count_rows(csv_file):
+    with open(
+        os.path.join(FILE_DIR, csv_file), encoding='utf-8', newline=''
+    ) as file:
+        return sum(1 for _ in csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12LoadCsvInDb:
+
+    def test_01_load_all_tables(self):
+        out = StringIO()
+        call_command('load_csv_in_db', batch_size=5, stdout=out)
+
+        for model, csv_file in TABLES.items():
+            assert model.objects.count() == count_rows(csv_file), csv_file
+        assert 'строк/с' in out.getvalue()
+
+        review = Review.objects.get(pk=1)
+        assert review.author_id == 100
+        assert review.pub_date.isoformat().startswith('2019-09-24T21:08:21')
+
+        title = Title.objects.get(pk=1)
+        assert title.genre.exists()
+        assert title.rating_count == title.reviews.count()
+
+
+def run_command(tmp_path, database, *args):
+    """Запускает manage.py в отдельном процессе с файловой базой."""
+    settings = tmp_path / 'import_settings.py'
+    settings.write_text(
+        'from api_yamdb.settings import *  # noqa\n'
+        f'DATABASES["default"]["NAME"] = {str(database)!r}\n',
+        encoding='utf-8',
+    )
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE='import_settings',
+        PYTHONPATH=os.pathsep.join((str(tmp_path), MANAGE_DIR)),
+    )
+    return subprocess.run(
+        [sys.executable, 'manage.py', *args],
+        cwd=MANAGE_DIR, env=env, capture_output=True, text=True,
+    )
+
+
+def count_tables(database):
+    with closing(sqlite3.connect(database)) as connection:
+        return {
+            model: connection.execute(
+                f'SELECT COUNT(*) FROM {model._meta.db_table}'
+            ).fetchone()[0]
+            for model in TABLES
+        }
+
+
+def load(tmp_path, name, *args):
+    database = tmp_path / f'{name}.sqlite3'
+    result = run_command(tmp_path, database, 'migrate')
+    assert result.returncode == 0, result.stderr
+    result = run_command(
+        tmp_path, database, 'load_csv_in_db', '--batch-size', '5', *args
+    )
+    return database, result
+
+
+class Test12ParallelLoadCsvInDb:
+    """Параллельная загрузка в файловые базы: пул не видит тестовую."""
+
+    def test_02_parallel_matches_sequential(self, tmp_path):
+        sequential, result = load(tmp_path, 'sequential')
+        assert result.returncode == 0, result.stderr
+        parallel, result = load(tmp_path, 'parallel', '--workers', '2')
+        assert result.returncode == 0, result.stderr
+
+        expected = count_tables(sequential)
+        assert count_tables(parallel) == expected
+        assert expected[Title] == count_rows(TABLES[Title])
+
+    def test_03_parallel_resume(self, tmp_path):
+        data_dir = tmp_path / 'data'
+        shutil.copytree(FILE_DIR, data_dir)
+        review_csv = data_dir / TABLES[Review]
+        original = review_csv.read_text(encoding='utf-8')
+        rows = list(csv.reader(StringIO(original)))
+        # Последняя строка с неверной оценкой: часть пачек уже загружена.
+        rows[-1][rows[0].index('score')] = 'плохо'
+        buffer = StringIO()
+        csv.writer(buffer).writerows(rows)
+        review_csv.write_text(buffer.getvalue(), encoding='utf-8')
+        args = ('--data-dir', str(data_dir), '--incremental', '--workers', '2')
+
+        database, result = load(tmp_path, 'resumed', *args)
+        assert result.returncode != 0
+        assert 'Повторный запуск продолжит загрузку' in result.stderr
+
+        review_csv.write_text(original, encoding='utf-8')
+        result = run_command(
+            tmp_path, database, 'load_csv_in_db', '--batch-size', '5', *args
+        )
+        assert result.returncode == 0, result.stderr
+        assert 'уже загружен' in result.stdout
+        for model, csv_file in TABLES.items():
+            assert count_tables(database)[model] == count_rows(csv_file)
+
+        result = run_command(
+            tmp_path, database, 'load_csv_in_db', '--batch-size', '5', *args
+        )
+        assert result.returncode == 0, result.stderr
+        assert 'загружен:' not in result.stdout
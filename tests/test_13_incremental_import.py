@@ -0,0 +1,83 @@
+import csv
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.management.commands import load_csv_in_db
+from reviews.models import ImportCheckpoint, Review, Title
+
+REVIEW_HEADER = ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+
+
+def write_reviews(path, rows):
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(REVIEW_HEADER)
+        writer.writerows(rows)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13IncrementalImport:
+
+    @pytest.fixture
+    def loaded(self):
+        call_command('load_csv_in_db', stdout=StringIO())
+
+    def test_01_delta_is_upserted_idempotently(self, loaded, tmp_path):
+        reviews_count = Review.objects.count()
+        write_reviews(tmp_path / 'review.csv', (
+            (1, 1, 'Изменённый отзыв', 100, 1, '2019-09-24T21:08:21.567Z'),
+            (1000, 1, 'Новый отзыв', 104, 5, '2021-01-01T00:00:00Z'),
+        ))
+        for _ in range(2):
+            call_command(
+                'load_csv_in_db', incremental=True, data_dir=tmp_path,
+                stdout=StringIO()
+            )
+            assert Review.objects.count() == reviews_count + 1
+            assert Review.objects.get(pk=1).score == 1
+            assert Review.objects.get(pk=1000).text == 'Новый отзыв'
+
+        title = Title.objects.get(pk=1)
+        assert title.rating_count == title.reviews.count()
+        checkpoint = ImportCheckpoint.objects.get()
+        assert checkpoint.completed and checkpoint.rows == 2
+
+    def test_02_resume_after_interruption(
+        self, loaded, tmp_path, monkeypatch
+    ):
+        title = Title.objects.create(name='Новое', year=2000, category_id=1)
+        write_reviews(tmp_path / 'review.csv', (
+            (1001 + i, title.id, f'Отзыв {i}', 100 + i, 7,
+             '2021-01-01T00:00:00Z')
+            for i in range(5)
+        ))
+        calls = []
+        upsert_rows = load_csv_in_db.upsert_rows
+
+        def failing_upsert(*args):
+            calls.append(args)
+            if len(calls) == 3:
+                raise RuntimeError('interrupted')
+            return upsert_rows(*args)
+
+        monkeypatch.setattr(load_csv_in_db, 'upsert_rows', failing_upsert)
+        with pytest.raises(RuntimeError):
+            call_command(
+                'load_csv_in_db', incremental=True, data_dir=tmp_path,
+                batch_size=2, stdout=StringIO()
+            )
+        checkpoint = ImportCheckpoint.objects.get()
+        assert checkpoint.rows == 4 and not checkpoint.completed
+        assert Review.objects.filter(pk__gt=1000).count() == 4
+
+        monkeypatch.setattr(load_csv_in_db, 'upsert_rows', upsert_rows)
+        calls.clear()
+        call_command(
+            'load_csv_in_db', incremental=True, data_dir=tmp_path,
+            batch_size=2, stdout=StringIO()
+        )
+        checkpoint.refresh_from_db()
+        assert checkpoint.rows == 5 and checkpoint.completed
+        assert Review.objects.filter(pk__gt=1000).count() == 5
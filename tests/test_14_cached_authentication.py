@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from reviews.management.commands.load_csv_in_db import upsert_rows
+from users import authentication
+from users.authentication import CachedJWTAuthentication
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14CachedAuthentication:
+
+    TOKEN_URL = '/api/v1/auth/token/'
+    USERS_URL = '/api/v1/users/'
+
+    @pytest.fixture(autouse=True)
+    def cached_authentication(self, settings, monkeypatch, tmp_path):
+        settings.CACHES = {
+            **django_settings.CACHES,
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': str(tmp_path / 'cache'),
+            },
+        }
+        monkeypatch.setattr(
+            APIView, 'authentication_classes', [CachedJWTAuthentication]
+        )
+        authentication._user_states.clear()
+
+    def get_client(self, user):
+        response = APIClient().post(self.TOKEN_URL, data={
+            'username': user.username,
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert response.status_code == HTTPStatus.OK
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {response.json()["token"]}'
+        )
+        return client
+
+    def test_01_no_user_query(self, user, django_assert_num_queries):
+        client = self.get_client(user)
+        with django_assert_num_queries(3):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        with django_assert_num_queries(0):
+            response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    def test_02_role_change_invalidates_claims(self, user, admin_client):
+        client = self.get_client(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
+
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'admin'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        admin_client.delete(f'{self.USERS_URL}{user.username}/')
+        response = client.get(self.USERS_URL)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+
+    def test_03_me_returns_full_profile(self, user):
+        response = self.get_client(user).get(f'{self.USERS_URL}me/')
+        assert response.json()['email'] == user.email
+        assert response.json()['bio'] == user.bio
+
+    def test_04_requires_shared_cache(self, settings):
+        settings.CACHES = {
+            **settings.CACHES,
+            'default': {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            },
+        }
+        with pytest.raises(ImproperlyConfigured):
+            CachedJWTAuthentication()
+
+    def test_05_import_invalidates_claims(self, user):
+        client = self.get_client(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
+        upsert_rows(
+            User, ['id', 'username', 'email', 'role'],
+            [(user.pk, user.username, user.email, 'admin')],
+        )
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+    def test_06_user_states_bounded(self, settings, user, admin):
+        settings.USER_STATE_CACHE_SIZE = 1
+        self.get_client(user).get(self.USERS_URL)
+        self.get_client(admin).get(self.USERS_URL)
+        assert list(authentication._user_states) == [admin.pk]
+
+    def test_07_evicted_stamp_not_trusted(self, user, admin_client):
+        User.objects.filter(pk=user.pk).update(role='admin')
+        user.refresh_from_db()
+        client = self.get_client(user)
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.OK
+
+        response = admin_client.patch(
+            f'{self.USERS_URL}{user.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        # Метка вытеснена из кэша, другой процесс о ней не знает.
+        cache.clear()
+        authentication._user_states.clear()
+        assert client.get(self.USERS_URL).status_code == HTTPStatus.FORBIDDEN
@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core import mail
+from django.core.mail import EmailMessage
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from users.management.commands.send_emails import Command
+from users.models import OutgoingEmail
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15EmailOutbox:
+
+    URL_SIGNUP = '/api/v1/auth/signup/'
+
+    def signup(self, client, count):
+        for i in range(count):
+            client.post(self.URL_SIGNUP, data={
+                'email': f'user{i}@yamdb.fake', 'username': f'user{i}'
+            })
+
+    def test_01_signup_only_queues_email(self, client):
+        self.signup(client, 3)
+        assert len(mail.outbox) == 0
+        assert OutgoingEmail.objects.filter(sent_at__isnull=True).count() == 3
+
+        call_command('send_emails', batch_size=2, stdout=StringIO())
+        assert sorted(message.to[0] for message in mail.outbox) == [
+            f'user{i}@yamdb.fake' for i in range(3)
+        ]
+        assert 'Код подтверждения' in mail.outbox[0].body
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
+
+        call_command('send_emails', stdout=StringIO())
+        assert len(mail.outbox) == 3
+
+    def test_02_failed_email_is_retried_later(self, client, monkeypatch):
+        self.signup(client, 1)
+
+        def fail(message, *args, **kwargs):
+            raise ConnectionError('smtp is down')
+
+        monkeypatch.setattr(EmailMessage, 'send', fail)
+        call_command('send_emails', stdout=StringIO())
+        email = OutgoingEmail.objects.get()
+        assert email.sent_at is None
+        assert email.attempts == 1
+        assert email.last_error == 'smtp is down'
+        assert email.send_after > timezone.now()
+
+        monkeypatch.undo()
+        call_command('send_emails', stdout=StringIO())
+        assert len(mail.outbox) == 0
+
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        call_command('send_emails', stdout=StringIO())
+        assert len(mail.outbox) == 1
+
+    def test_03_sent_outside_transaction(self, client, monkeypatch):
+        self.signup(client, 2)
+        send = EmailMessage.send
+        claimed = []
+
+        def check(message, *args, **kwargs):
+            assert not connection.in_atomic_block
+            # Письма пачки уже забраны: другой обработчик их не получит.
+            claimed.append(Command.claim(10, timezone.now()))
+            return send(message, *args, **kwargs)
+
+        monkeypatch.setattr(EmailMessage, 'send', check)
+        call_command('send_emails', stdout=StringIO())
+        assert claimed == [[], []]
+        assert len(mail.outbox) == 2
+        assert not OutgoingEmail.objects.filter(sent_at__isnull=True).exists()
@@ -0,0 +1,63 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from reviews.models import Review
+from users.authentication import RoleAccessToken
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16ReviewQueries:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture
+    def client(self, user):
+        # Токен выдан после последнего изменения пользователя.
+        cache.clear()
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+        return client
+
+    def test_01_create_review_queries(
+        self, client, title, django_assert_num_queries
+    ):
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        data = {'text': 'Отзыв', 'score': 7}
+        # Пользователь, произведение, BEGIN, вставка отзыва, обновление
+        # рейтинга, распределения оценок (первая оценка 7 создаётся в точке
+        # сохранения) и версии произведений.
+        with django_assert_num_queries(10):
+            response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+
+        response = client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Можно оставить только один отзыв для одного произведения!'
+        ]}
+        assert Review.objects.count() == 1
+        title.refresh_from_db()
+        assert title.rating_count == 1
+
+    def test_02_review_detail_queries(
+        self, client, title, user, django_assert_num_queries
+    ):
+        review = Review.objects.create(
+            title=title, author=user, text='Отзыв', score=5
+        )
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        # Пользователь и отзыв с автором.
+        with django_assert_num_queries(2):
+            response = client.get(f'{url}{review.id}/')
+        assert response.json()['author'] == user.username
+
+        response = client.get(
+            self.REVIEWS_URL_TEMPLATE.format(title_id=title.id + 1)
+            + f'{review.id}/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
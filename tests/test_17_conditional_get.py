@@ -0,0 +1,83 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Genre, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17ConditionalGet:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.mark.parametrize('url', (TITLES_URL, GENRES_URL, CATEGORIES_URL))
+    def test_01_not_modified_without_queries(
+        self, client, title, url, django_assert_num_queries
+    ):
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+        assert response['Last-Modified']
+
+        with django_assert_num_queries(1):
+            response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert not response.content
+
+    def test_02_title_detail(self, client, title):
+        url = f'{self.TITLES_URL}{title.id}/'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+        response = client.get(f'{self.TITLES_URL}{title.id + 1}/')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert 'ETag' not in response
+
+    def test_03_writes_change_etag(self, client, admin_client, user, title):
+        etag = client.get(self.TITLES_URL)['ETag']
+        genres_etag = client.get(self.GENRES_URL)['ETag']
+
+        Review.objects.create(title=title, author=user, text='Отзыв', score=8)
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'][0]['rating'] == 8
+
+        response = admin_client.post(
+            self.GENRES_URL, data={'name': 'Комедия', 'slug': 'comedy'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        response = client.get(self.GENRES_URL, HTTP_IF_NONE_MATCH=genres_etag)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results']) == 2
+
+        etag = client.get(self.TITLES_URL)['ETag']
+        title.genre.add(Genre.objects.get(slug='comedy'))
+        response = client.get(self.TITLES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.json()['results'][0]['genre']) == 2
+
+    @pytest.mark.parametrize('suffix', ('', 'stats/'))
+    def test_04_detail_etag_for_missing_object(self, client, title, suffix):
+        url = f'{self.TITLES_URL}{title.id}/{suffix}'
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        etag = response['ETag']
+
+        missing_url = f'{self.TITLES_URL}{title.id + 1}/{suffix}'
+        response = client.get(
+            missing_url,
+            HTTP_IF_NONE_MATCH=etag,
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert 'ETag' not in response
+
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
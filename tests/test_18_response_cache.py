@@ -0,0 +1,92 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+
+from api.v1.cache import get_stats
+from reviews.models import Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ResponseCache:
+
+    TITLES_URL = '/api/v1/titles/'
+    GENRES_URL = '/api/v1/genres/'
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+
+    def test_01_anonymous_hit(self, client, title, django_assert_num_queries):
+        response = client.get(self.TITLES_URL, {'year': 1997, 'name': 'Тит'})
+        assert response.status_code == HTTPStatus.OK
+        assert get_stats() == {'hits': 0, 'misses': 1}
+
+        # Тот же запрос с другим порядком и пустым параметром.
+        with django_assert_num_queries(1):
+            cached = client.get(
+                self.TITLES_URL, {'name': 'Тит', 'genre': '', 'year': 1997}
+            )
+        assert cached.status_code == HTTPStatus.OK
+        assert cached.json() == response.json()
+        assert cached['ETag'] == response['ETag']
+        assert get_stats() == {'hits': 1, 'misses': 1}
+
+        client.get(self.TITLES_URL, {'year': 1997, 'page': 2})
+        assert get_stats() == {'hits': 1, 'misses': 2}
+
+    def test_02_invalidated_by_changes(self, client, user, title):
+        client.get(self.TITLES_URL)
+        Review.objects.create(title=title, author=user, text='Отзыв', score=6)
+        response = client.get(self.TITLES_URL)
+        assert response.json()['results'][0]['rating'] == 6
+
+        client.get(self.GENRES_URL)
+        Genre.objects.get(slug='drama').delete()
+        assert client.get(self.GENRES_URL).json()['results'] == []
+        assert client.get(self.TITLES_URL).json()['results'][0][
+            'genre'
+        ] == []
+        assert get_stats()['hits'] == 0
+
+    def test_03_authenticated_not_cached(self, user_client, title):
+        user_client.get(self.TITLES_URL)
+        user_client.get(self.TITLES_URL)
+        assert get_stats() == {'hits': 0, 'misses': 0}
+
+    def test_04_key_includes_host_and_media_type(self, client, title):
+        Title.objects.bulk_create([
+            Title(name=f'Произведение {i}', year=2000,
+                  category=title.category)
+            for i in range(10)
+        ])
+        for params in ({}, {'cursor': ''}):
+            evil = client.get(
+                self.TITLES_URL, params, HTTP_HOST='evil.example'
+            )
+            assert evil.json()['next'].startswith('http://evil.example/')
+            response = client.get(self.TITLES_URL, params)
+            assert response.json()['next'].startswith('http://testserver/')
+
+        indented = client.get(
+            self.TITLES_URL, HTTP_ACCEPT='application/json; indent=4'
+        )
+        assert b'\n    "count"' in indented.content
+        response = client.get(self.TITLES_URL, HTTP_ACCEPT='application/json')
+        assert response.content.startswith(b'{"count"')
+
+    def test_05_stats_exposed(self, client, title, settings, tmp_path):
+        client.get(self.TITLES_URL)
+        client.get(self.TITLES_URL)
+        output = StringIO()
+        call_command('dump_metrics', stdout=output)
+        assert 'Кэш ответов: попаданий 1, промахов 1' in output.getvalue()
+
+        settings.METRICS_ENABLED = True
+        settings.METRICS_DIR = str(tmp_path)
+        text = client.get('/metrics').content.decode()
+        assert 'api_response_cache_hits_total 1\n' in text
+        assert 'api_response_cache_misses_total 1\n' in text
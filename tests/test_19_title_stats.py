@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, ScoreCount
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+
+    @pytest.fixture
+    def authors(self):
+        User.objects.bulk_create(
+            User(username=f'author{i}', email=f'author{i}@yamdb.fake')
+            for i in range(4)
+        )
+        return list(User.objects.filter(username__startswith='author'))
+
+    def get_stats(self, client, title):
+        response = client.get(self.STATS_URL_TEMPLATE.format(title_id=title.id))
+        assert response.status_code == HTTPStatus.OK
+        return response.json()
+
+    def test_01_empty(self, client, title):
+        stats = self.get_stats(client, title)
+        assert stats == {
+            'count': 0,
+            'average': None,
+            'distribution': {str(score): 0 for score in range(1, 11)},
+        }
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title.id + 1)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_02_incremental_updates(
+        self, client, title, authors, django_assert_num_queries
+    ):
+        reviews = [
+            Review.objects.create(
+                title=title, author=author, text='Отзыв', score=score
+            )
+            for author, score in zip(authors, (10, 10, 7, 3))
+        ]
+        with django_assert_num_queries(3):
+            stats = self.get_stats(client, title)
+        assert stats['count'] == 4
+        assert stats['average'] == 7.5
+        assert stats['distribution']['10'] == 2
+        assert stats['distribution']['7'] == 1
+        assert stats['distribution']['3'] == 1
+
+        reviews[0].score = 3
+        reviews[0].save()
+        reviews[2].delete()
+        stats = self.get_stats(client, title)
+        assert stats['count'] == 3
+        assert stats['distribution']['10'] == 1
+        assert stats['distribution']['7'] == 0
+        assert stats['distribution']['3'] == 2
+
+        title.delete()
+        assert not ScoreCount.objects.exists()
+
+    def test_03_recalculate(self, client, title, authors):
+        Review.objects.bulk_create(
+            Review(title=title, author=author, text='Отзыв', score=5)
+            for author in authors
+        )
+        assert self.get_stats(client, title)['count'] == 0
+        call_command('recalculate_ratings')
+        stats = self.get_stats(client, title)
+        assert stats['count'] == 4
+        assert stats['distribution']['5'] == 4
@@ -0,0 +1,125 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from reviews.models import Category, Genre, ResourceVersion, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20BulkTitles:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+
+    @pytest.fixture(autouse=True)
+    def catalog(self):
+        Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'category-{i}')
+            for i in range(3)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(5)
+        )
+        ResourceVersion.bump('titles')
+
+    def test_01_create(self, admin_client, django_assert_num_queries):
+        data = [
+            {
+                'name': f'Произведение {i}',
+                'year': 1990 + i,
+                'category': f'category-{i % 3}',
+                'genre': [f'genre-{i % 5}', f'genre-{(i + 1) % 5}'],
+            }
+            for i in range(30)
+        ]
+        # Пользователь (токен фикстуры без роли), версии и строки категорий
+        # и жанров, BEGIN, произведения, их ключи, связи с жанрами и версия
+        # произведений.
+        with django_assert_num_queries(10):
+            response = admin_client.post(self.BULK_URL, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert len(results) == 30
+        assert Title.objects.count() == 30
+        for item, result in zip(data, results):
+            title = Title.objects.get(pk=result['id'])
+            assert title.name == item['name']
+            assert title.category.slug == item['category']
+            assert sorted(
+                title.genre.values_list('slug', flat=True)
+            ) == sorted(item['genre'])
+
+    def test_02_per_item_errors(self, admin_client):
+        data = [
+            {'name': 'Верное', 'year': 2000, 'category': 'category-0',
+             'genre': ['genre-0']},
+            {'name': 'Без жанра', 'year': 2000, 'category': 'category-0',
+             'genre': []},
+            {'name': 'Чужая категория', 'year': 2000, 'category': 'missing',
+             'genre': ['genre-0']},
+            {'name': 'Чужой жанр', 'year': 2000, 'category': 'category-0',
+             'genre': ['genre-0', 'missing']},
+            {'name': 'Из будущего', 'year': 3000, 'category': 'category-0',
+             'genre': ['genre-0']},
+            'не произведение',
+        ]
+        response = admin_client.post(self.BULK_URL, data, format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()['results']
+        assert 'id' in results[0]
+        assert list(results[1]['errors']) == ['genre']
+        assert list(results[2]['errors']) == ['category']
+        assert list(results[3]['errors']) == ['genre']
+        assert list(results[4]['errors']) == ['year']
+        assert 'errors' in results[5]
+        assert list(Title.objects.values_list('name', flat=True)) == [
+            'Верное'
+        ]
+
+        response = admin_client.post(self.BULK_URL, data[1:], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        response = admin_client.post(self.BULK_URL, data[0], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_update(self, admin_client):
+        response = admin_client.post(self.BULK_URL, [
+            {'name': f'Произведение {i}', 'year': 2000,
+             'category': 'category-0', 'genre': ['genre-0']}
+            for i in range(3)
+        ], format='json')
+        ids = [result['id'] for result in response.json()['results']]
+
+        response = admin_client.patch(self.BULK_URL, [
+            {'id': ids[0], 'year': 2001},
+            {'id': ids[1], 'category': 'category-1',
+             'genre': ['genre-1', 'genre-2']},
+            {'id': ids[2] + 100, 'year': 2001},
+            {'year': 2001},
+        ], format='json')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert results[0] == {'id': ids[0]}
+        assert results[1] == {'id': ids[1]}
+        assert list(results[2]['errors']) == ['id']
+        assert list(results[3]['errors']) == ['id']
+
+        first, second, third = Title.objects.filter(pk__in=ids).order_by('id')
+        assert first.year == 2001
+        assert first.category.slug == 'category-0'
+        assert list(first.genre.values_list('slug', flat=True)) == [
+            'genre-0'
+        ]
+        assert second.category.slug == 'category-1'
+        assert sorted(second.genre.values_list('slug', flat=True)) == [
+            'genre-1', 'genre-2'
+        ]
+        assert third.year == 2000
+
+    def test_04_permissions(self, user_client):
+        data = [{'name': 'Произведение', 'year': 2000,
+                 'category': 'category-0', 'genre': ['genre-0']}]
+        response = APIClient().post(self.BULK_URL, data, format='json')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.BULK_URL, data, format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert not Title.objects.exists()
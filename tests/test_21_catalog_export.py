@@ -0,0 +1,121 @@
+import csv
+import json
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import call_command
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21CatalogExport:
+
+    EXPORT_URL = '/api/v1/titles/export/'
+
+    @pytest.fixture
+    def loaded(self):
+        call_command('load_csv_in_db', stdout=StringIO())
+
+    @staticmethod
+    def get_catalog():
+        return (
+            list(Category.objects.order_by('id').values()),
+            list(Genre.objects.order_by('id').values()),
+            # Рейтинг load_csv_in_db пересчитывает по загруженным отзывам.
+            list(Title.objects.order_by('id').values(
+                'id', 'name', 'year', 'description', 'category'
+            )),
+            list(Title.genre.through.objects.order_by('id').values()),
+        )
+
+    def test_01_ndjson(self, client, loaded):
+        response = client.get(self.EXPORT_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming
+        assert response['Content-Type'] == 'application/x-ndjson'
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        titles = [json.loads(line) for line in lines]
+        assert [title['id'] for title in titles] == list(
+            Title.objects.order_by('id').values_list('id', flat=True)
+        )
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert titles[0]['category'] == title.category.slug
+        assert titles[0]['genre'] == sorted(
+            title.genre.values_list('slug', flat=True)
+        )
+        assert titles[0]['rating'] == title.rating
+
+    def test_02_csv(self, client, loaded):
+        response = client.get(
+            self.EXPORT_URL, {'type': 'csv', 'table': 'genre_title'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'] == 'text/csv'
+        rows = list(csv.reader(
+            b''.join(response.streaming_content).decode().splitlines()
+        ))
+        assert rows[0] == ['id', 'title_id', 'genre_id']
+        assert len(rows) == Title.genre.through.objects.count() + 1
+
+        for params in ({'type': 'xml'}, {'type': 'csv', 'table': 'users'}):
+            response = client.get(self.EXPORT_URL, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_command_round_trip(self, loaded, tmp_path):
+        catalog = self.get_catalog()
+        call_command(
+            'export_catalog', data_dir=tmp_path, chunk_size=7,
+            stdout=StringIO()
+        )
+        Title.objects.all().delete()
+        Category.objects.all().delete()
+        Genre.objects.all().delete()
+        call_command(
+            'load_csv_in_db', incremental=True, data_dir=tmp_path,
+            stdout=StringIO()
+        )
+        assert self.get_catalog() == catalog
+
+    def test_04_command_ndjson(self, loaded, tmp_path):
+        output = tmp_path / 'titles.ndjson'
+        call_command(
+            'export_catalog', format='ndjson', output=output,
+            chunk_size=5, stdout=StringIO()
+        )
+        lines = output.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == Title.objects.count()
+
+    def test_05_asgi(self, loaded):
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        async_to_sync(ASGIHandler())({
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': 'GET',
+            'scheme': 'http',
+            'path': self.EXPORT_URL,
+            'raw_path': self.EXPORT_URL.encode(),
+            'query_string': b'type=csv&table=titles',
+            'root_path': '',
+            'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 50000),
+            'server': ('testserver', 80),
+        }, receive, send)
+        assert messages[0]['status'] == HTTPStatus.OK
+        content = b''.join(
+            message.get('body', b'') for message in messages[1:]
+        )
+        rows = list(csv.reader(content.decode().splitlines()))
+        assert rows[0][0] == 'id'
+        assert len(rows) == Title.objects.count() + 1
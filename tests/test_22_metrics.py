@@ -0,0 +1,100 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.metrics import registry
+from reviews.models import Category
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Metrics:
+
+    GENRES_URL = '/api/v1/genres/'
+    CATEGORIES_URL = '/api/v1/categories/'
+
+    @pytest.fixture(autouse=True)
+    def metrics(self, settings, tmp_path):
+        settings.METRICS_ENABLED = True
+        settings.METRICS_DIR = str(tmp_path)
+        settings.MIDDLEWARE = [
+            'api.middleware.MetricsMiddleware', *settings.MIDDLEWARE
+        ]
+        registry.clear()
+        yield
+        registry.clear()
+
+    def test_01_server_timing(self, client):
+        Category.objects.create(name='Фильм', slug='film')
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        timing = response['Server-Timing']
+        assert re.fullmatch(
+            r'db;dur=[\d.]+;desc="(\d+) queries", '
+            r'serializer;dur=[\d.]+, total;dur=[\d.]+',
+            timing
+        )
+        assert int(re.search(r'"(\d+) queries"', timing).group(1)) >= 2
+
+    def test_02_route_histograms(self, client):
+        for _ in range(3):
+            client.get(self.GENRES_URL)
+        client.get(self.CATEGORIES_URL)
+        client.get('/api/v1/missing/')
+
+        output = StringIO()
+        call_command('dump_metrics', format='json', stdout=output)
+        routes = json.loads(output.getvalue())
+        assert set(routes) == {'genres-list', 'categories-list', 'unmatched'}
+        histogram = routes['genres-list']['db_queries']
+        assert histogram['count'] == 3
+        assert sum(histogram['buckets']) == 3
+        assert routes['genres-list']['serializer_duration_seconds']['sum'] > 0
+
+        output = StringIO()
+        call_command('dump_metrics', stdout=output)
+        assert 'genres-list' in output.getvalue()
+
+    def test_03_prometheus(self, client):
+        client.get(self.GENRES_URL)
+        response = client.get('/metrics')
+        assert response.status_code == HTTPStatus.OK
+        text = response.content.decode()
+        assert '# TYPE api_request_duration_seconds histogram' in text
+        assert (
+            'api_request_duration_seconds_count{route="genres-list"} 1'
+            in text
+        )
+        assert 'api_db_queries_bucket{route="genres-list",le="+Inf"} 1' in (
+            text
+        )
+
+    def test_04_disabled(self, client, settings):
+        settings.METRICS_ENABLED = False
+        assert client.get('/metrics').status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_allowed_ips(self, client, settings):
+        response = client.get('/metrics', REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        settings.METRICS_ALLOWED_IPS = ['10.0.0.1']
+        response = client.get('/metrics', REMOTE_ADDR='10.0.0.1')
+        assert response.status_code == HTTPStatus.OK
+
+    def test_06_dead_processes_pruned(self, client, settings):
+        process = subprocess.Popen([sys.executable, '-c', ''])
+        process.wait()
+        path = os.path.join(settings.METRICS_DIR, f'{process.pid}.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump({'stale-route': {}}, file)
+        client.get(self.GENRES_URL)
+
+        output = StringIO()
+        call_command('dump_metrics', format='json', stdout=output)
+        assert set(json.loads(output.getvalue())) == {'genres-list'}
+        assert not os.path.exists(path)
@@ -0,0 +1,53 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+from core.db.backends.sqlite3.base import DatabaseWrapper
+
+
+def get_wrapper(tmp_path, pragmas):
+    settings_dict = {
+        **connection.settings_dict,
+        'NAME': str(tmp_path / 'db.sqlite3'),
+        'OPTIONS': {'pragmas': pragmas},
+    }
+    return DatabaseWrapper(settings_dict, alias='pragmas')
+
+
+def read_pragma(wrapper, name):
+    with wrapper.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SqlitePragmas:
+
+    def test_01_pragmas_applied(self, tmp_path):
+        wrapper = get_wrapper(tmp_path, {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 1234,
+            'mmap_size': 1048576,
+            'cache_size': -2000,
+            'temp_store': 'MEMORY',
+        })
+        try:
+            assert read_pragma(wrapper, 'journal_mode') == 'wal'
+            assert read_pragma(wrapper, 'synchronous') == 1
+            assert read_pragma(wrapper, 'busy_timeout') == 1234
+            assert read_pragma(wrapper, 'mmap_size') == 1048576
+            assert read_pragma(wrapper, 'cache_size') == -2000
+            assert read_pragma(wrapper, 'temp_store') == 2
+            assert read_pragma(wrapper, 'foreign_keys') == 1
+        finally:
+            wrapper.close()
+
+    @pytest.mark.parametrize('pragmas', (
+        {'journal_mode': 'WAL; DROP TABLE users_user'},
+        {'writable_schema': 'ON'},
+    ))
+    def test_02_invalid_pragmas(self, tmp_path, pragmas):
+        wrapper = get_wrapper(tmp_path, pragmas)
+        with pytest.raises(ImproperlyConfigured):
+            wrapper.ensure_connection()
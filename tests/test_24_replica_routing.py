@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from api.v1 import views
+from core.db.routers import read_database
+from reviews.models import Category, Review, Title
+
+REPLICAS = ('replica_1', 'replica_2')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24ReplicaRouting:
+
+    CATEGORIES_URL = '/api/v1/categories/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, transactional_db, settings, tmp_path):
+        for alias in REPLICAS:
+            connections.databases[alias] = {
+                **connections.databases[DEFAULT_DB_ALIAS],
+                'NAME': str(tmp_path / f'{alias}.sqlite3'),
+            }
+        settings.DATABASE_REPLICAS = REPLICAS
+        cache.clear()
+        yield
+        for alias in REPLICAS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.databases[alias]
+        cache.clear()
+
+    def get_names(self, client):
+        response = client.get(self.CATEGORIES_URL)
+        assert response.status_code == HTTPStatus.OK
+        return {item['name'] for item in response.json()['results']}
+
+    def test_01_reads_from_replica(self, user_client):
+        Category.objects.create(name='Фильм', slug='film')
+        call_command('sync_replicas')
+        Category.objects.create(name='Книга', slug='book')
+        assert self.get_names(user_client) == {'Фильм'}
+        assert self.get_names(user_client) == {'Фильм'}
+        assert Category.objects.count() == 2
+
+    def test_02_round_robin(self, user_client):
+        Category.objects.create(name='Фильм', slug='film')
+        call_command('sync_replicas', 'replica_1')
+        Category.objects.create(name='Книга', slug='book')
+        call_command('sync_replicas', 'replica_2')
+        names = [self.get_names(user_client) for _ in range(4)]
+        assert names[0] != names[1]
+        assert names[:2] == names[2:]
+
+    def test_03_read_your_writes(self, user_client, settings):
+        category = Category.objects.create(name='Фильм', slug='film')
+        title = Title.objects.create(
+            name='Титаник', year=1997, category=category
+        )
+        call_command('sync_replicas')
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=title.id)
+        response = user_client.post(url, data={'text': 'Отзыв', 'score': 7})
+        assert response.status_code == HTTPStatus.CREATED
+        assert Review.objects.using(DEFAULT_DB_ALIAS).count() == 1
+        assert Review.objects.using('replica_1').count() == 0
+        assert user_client.get(url).json()['count'] == 1
+
+        settings.REPLICA_STICKY_SECONDS = 0
+        cache.clear()
+        assert user_client.get(url).json()['count'] == 0
+
+    def test_04_without_replicas(self, user_client, settings):
+        settings.DATABASE_REPLICAS = ()
+        Category.objects.create(name='Фильм', slug='film')
+        assert self.get_names(user_client) == {'Фильм'}
+
+    def test_05_reset_after_error(self, user_client, monkeypatch):
+        category = Category.objects.create(name='Фильм', slug='film')
+        title = Title.objects.create(
+            name='Титаник', year=1997, category=category
+        )
+        call_command('sync_replicas')
+
+        def fail(*args, **kwargs):
+            raise RuntimeError
+
+        monkeypatch.setattr(views.TitleViewSet, 'get_stats', fail)
+        user_client.raise_request_exception = False
+        response = user_client.get(f'/api/v1/titles/{title.id}/stats/')
+        assert response.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+        assert read_database.get() is None
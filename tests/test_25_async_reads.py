@@ -0,0 +1,120 @@
+import asyncio
+import json
+import re
+import threading
+from http import HTTPStatus
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.core.cache import caches
+from django.test import AsyncRequestFactory, RequestFactory
+
+from api.metrics import registry
+from api.middleware import MetricsMiddleware
+from api.v1 import views
+from reviews.models import Genre, Review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25AsyncReads:
+
+    @pytest.fixture(autouse=True)
+    def async_reads(self, settings):
+        settings.ASYNC_READS = True
+        settings.ASYNC_READ_WORKERS = 2
+
+    @pytest.fixture
+    def review(self, title, user):
+        return Review.objects.create(
+            title=title, author=user, text='Отзыв', score=8
+        )
+
+    def get(self, viewset, actions, path, **kwargs):
+        """Ответы асинхронного и обычного представлений на один запрос."""
+        view = viewset.as_view(actions)
+        assert asyncio.iscoroutinefunction(view)
+        sync_response = view.__wrapped__(RequestFactory().get(path), **kwargs)
+        sync_response.render()
+        # Второй ответ не должен прийти из кэша ответов анонимным.
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+        async_response = async_to_sync(view)(
+            AsyncRequestFactory().get(path), **kwargs
+        )
+        return async_response, sync_response
+
+    @pytest.mark.parametrize('viewset, path', (
+        (views.GenreViewSet, '/api/v1/genres/'),
+        (views.CategoriesViewSet, '/api/v1/categories/'),
+        (views.TitleViewSet, '/api/v1/titles/'),
+    ))
+    def test_01_catalog_lists(self, title, viewset, path):
+        async_response, sync_response = self.get(
+            viewset, {'get': 'list'}, path
+        )
+        assert async_response.status_code == HTTPStatus.OK
+        assert async_response.content == sync_response.content
+        assert json.loads(async_response.content)['count'] == 1
+
+    def test_02_title_and_reviews(self, title, review):
+        async_response, sync_response = self.get(
+            views.TitleViewSet, {'get': 'retrieve'},
+            f'/api/v1/titles/{title.id}/', pk=str(title.id)
+        )
+        assert async_response.status_code == HTTPStatus.OK
+        assert json.loads(async_response.content)['rating'] == 8
+        async_response, _ = self.get(
+            views.ReviewViewSet, {'get': 'list'},
+            f'/api/v1/titles/{title.id}/reviews/', title_id=str(title.id)
+        )
+        assert json.loads(async_response.content)['count'] == 1
+
+    def test_03_runs_in_pool(self, title, monkeypatch):
+        threads = []
+        list_method = views.GenreViewSet.list
+
+        def list_genres(viewset, request, *args, **kwargs):
+            threads.append(threading.current_thread().name)
+            return list_method(viewset, request, *args, **kwargs)
+
+        monkeypatch.setattr(views.GenreViewSet, 'list', list_genres)
+        self.get(views.GenreViewSet, {'get': 'list'}, '/api/v1/genres/')
+        assert threads[-1].startswith('async-read')
+
+    def test_04_sync_views(self, settings):
+        view = views.TitleViewSet.as_view({'get': 'export'})
+        assert not asyncio.iscoroutinefunction(view)
+        settings.ASYNC_READS = False
+        view = views.TitleViewSet.as_view({'get': 'list'})
+        assert not asyncio.iscoroutinefunction(view)
+
+    def test_05_writes(self, token_admin):
+        view = views.GenreViewSet.as_view({'get': 'list', 'post': 'create'})
+        request = AsyncRequestFactory().post(
+            '/api/v1/genres/',
+            {'name': 'Драма', 'slug': 'drama'},
+            content_type='application/json',
+            authorization=f'Bearer {token_admin["access"]}',
+        )
+        response = async_to_sync(view)(request)
+        assert response.status_code == HTTPStatus.CREATED
+        assert Genre.objects.filter(slug='drama').exists()
+
+    def test_06_metrics_count_pool_queries(
+        self, settings, tmp_path, title, review
+    ):
+        settings.METRICS_DIR = str(tmp_path)
+        view = views.ReviewViewSet.as_view({'get': 'list'})
+        path = f'/api/v1/titles/{title.id}/reviews/'
+        middleware = MetricsMiddleware(
+            lambda request: async_to_sync(view)(
+                request, title_id=str(title.id)
+            )
+        )
+        response = middleware(AsyncRequestFactory().get(path))
+        assert response.status_code == HTTPStatus.OK
+        queries = re.search(
+            r'"(\d+) queries"', response['Server-Timing']
+        ).group(1)
+        assert int(queries) > 0
+        registry.clear()
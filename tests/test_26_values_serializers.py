@@ -0,0 +1,82 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews import lookups
+from reviews.models import Comment, Genre, Review, Title
+from users.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26ValuesSerializers:
+
+    @pytest.fixture
+    def titles(self, category, genre):
+        genres = [genre, Genre.objects.create(name='Боевик', slug='action')]
+        authors = [
+            User.objects.create(
+                username=f'author{i}', email=f'author{i}@yamdb.fake'
+            )
+            for i in range(3)
+        ]
+        titles = []
+        for i in range(12):
+            title = Title.objects.create(
+                name=f'Произведение {i}', year=2000 + i % 2,
+                description='Описание' if i % 2 else '', category=category,
+            )
+            title.genre.set(genres[:i % 3])
+            titles.append(title)
+        for author, score in zip(authors, (10, 7, 4)):
+            review = Review.objects.create(
+                title=titles[0], author=author, text='Отзыв', score=score
+            )
+            Comment.objects.create(
+                review=review, author=authors[0], text='Комментарий'
+            )
+        return titles
+
+    def get_both(self, client, settings, url, params=None):
+        settings.VALUES_LIST_VIEWSETS = ()
+        expected = client.get(url, params)
+        settings.VALUES_LIST_VIEWSETS = ('titles', 'reviews', 'comments')
+        response = client.get(url, params)
+        assert expected.status_code == HTTPStatus.OK
+        assert response.status_code == HTTPStatus.OK
+        return expected.content, response.content
+
+    @pytest.mark.parametrize('params', (
+        None,
+        {'year': 2001},
+        {'cursor': ''},
+        {'genre': 'drama'},
+        {'search': 'Произведение'},
+    ))
+    def test_01_titles(self, user_client, settings, titles, params):
+        expected, content = self.get_both(
+            user_client, settings, '/api/v1/titles/', params
+        )
+        assert content == expected
+
+    def test_02_reviews_and_comments(self, user_client, settings, titles):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        expected, content = self.get_both(user_client, settings, url)
+        assert content == expected
+        review = titles[0].reviews.first()
+        expected, content = self.get_both(
+            user_client, settings, f'{url}{review.id}/comments/',
+            {'cursor': ''},
+        )
+        assert content == expected
+
+    def test_03_query_count(
+        self, user_client, settings, titles, django_assert_num_queries
+    ):
+        settings.VALUES_LIST_VIEWSETS = ('titles',)
+        lookups.genres.slugs()
+        lookups.categories.slugs()
+        # Пользователь (в токене фикстуры нет роли), версия ресурса,
+        # количество, страница, жанры страницы и версии категорий и жанров.
+        with django_assert_num_queries(7):
+            response = user_client.get('/api/v1/titles/')
+        assert response.json()['count'] == len(titles)
@@ -0,0 +1,99 @@
+import datetime
+import decimal
+import uuid
+from collections import OrderedDict
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail
+from rest_framework.renderers import JSONRenderer
+
+from api import renderers
+from api.v1 import serializers
+from api.renderers import FastJSONRenderer
+from reviews.models import Genre, Title
+
+DATA = OrderedDict((
+    ('count', 2),
+    ('next', None),
+    ('text', 'Текст с "кавычками" и\u2028разделителями\u2029строк'),
+    ('score', 7.5),
+    ('date', datetime.datetime(
+        2023, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc
+    )),
+    ('day', datetime.date(2023, 1, 2)),
+    ('amount', decimal.Decimal('1.10')),
+    ('uuid', uuid.UUID(int=1)),
+    ('lazy', gettext_lazy('Категория')),
+    ('errors', [ErrorDetail('Обязательное поле.', code='required')]),
+    ('distribution', {1: 0, 10: 2}),
+    ('results', [{'id': 1, 'genre': []}, {'id': 2, 'genre': ('a', 'b')}]),
+))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27JsonRenderer:
+
+    def test_01_same_output(self):
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_02_indent(self):
+        media_type = 'application/json; indent=2'
+        assert FastJSONRenderer().render(DATA, media_type) == (
+            JSONRenderer().render(DATA, media_type)
+        )
+
+    def test_03_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        assert FastJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    @pytest.fixture
+    def titles(self, category, genre):
+        genres = [genre, Genre.objects.create(name='Боевик', slug='action')]
+        for i in range(3):
+            title = Title.objects.create(
+                name=f'Произведение {i}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    def test_04_titles_response(self, user_client, titles):
+        response = user_client.get('/api/v1/titles/')
+        assert isinstance(response.accepted_renderer, FastJSONRenderer)
+        results = response.json()['results']
+        assert len(results) == 3
+        assert all(
+            result['category'] == {'slug': 'film', 'name': 'Фильм'}
+            and result['genre'] == [
+                {'slug': 'action', 'name': 'Боевик'},
+                {'slug': 'drama', 'name': 'Драма'},
+            ]
+            for result in results
+        )
+
+    @pytest.mark.skipif(
+        not renderers.FRAGMENTS_SUPPORTED,
+        reason='orjson без поддержки Fragment',
+    )
+    def test_05_fragments(self):
+        data = {'category': renderers.json_fragment({'name': 'Фильм'})}
+        assert FastJSONRenderer().render(data) == (
+            '{"category":{"name":"Фильм"}}'.encode()
+        )
+
+    def test_06_fragment_rows(self, user_client, titles, monkeypatch):
+        expected = user_client.get('/api/v1/titles/').content
+        # Фрагменты подменены исходными значениями: проверяется, что
+        # строки собираются из общих закэшированных объектов.
+        monkeypatch.setattr(FastJSONRenderer, 'supports_fragments', True)
+        monkeypatch.setattr(serializers, 'json_fragment', lambda value: value)
+        serializers.slug_name_fragment.cache_clear()
+        serializers.genres_fragment.cache_clear()
+        try:
+            response = user_client.get('/api/v1/titles/')
+            assert response.content == expected
+            assert serializers.genres_fragment.cache_info().currsize == 1
+            assert serializers.slug_name_fragment.cache_info().currsize == 1
+        finally:
+            serializers.slug_name_fragment.cache_clear()
+            serializers.genres_fragment.cache_clear()
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews import lookups
+from reviews.models import Category, Genre, ResourceVersion, Title
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('category', 'genre')
+class Test28Lookups:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def slug_queries(self, context):
+        return [
+            query['sql'] for query in context.captured_queries
+            if '"slug" =' in query['sql'] or '"slug" IN' in query['sql']
+        ]
+
+    def test_01_slugs_resolved_in_memory(self, admin_client):
+        lookups.genres.slugs()
+        lookups.categories.slugs()
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.post(self.TITLES_URL, data={
+                'name': 'Титаник',
+                'year': 1997,
+                'category': 'film',
+                'genre': ['drama'],
+            })
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.json()['category'] == {'slug': 'film', 'name': 'Фильм'}
+        assert self.slug_queries(context) == []
+
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Титаник', 'year': 1997,
+            'category': 'film', 'genre': ['comedy'],
+        })
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'genre' in response.json()
+
+    def test_02_invalidated_on_write(self, admin_client):
+        assert 'comedy' not in lookups.genres.slugs()
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Комедия', 'slug': 'comedy'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert 'comedy' in lookups.genres.slugs()
+
+        Category.objects.filter(slug='film').delete()
+        assert 'film' not in lookups.categories.slugs()
+
+    def test_03_version_from_database(self):
+        genre = lookups.genres.slugs()['drama']
+        Genre.objects.filter(pk=genre.pk).update(name='Мелодрама')
+        assert lookups.genres.slugs()['drama'].name == 'Драма'
+        # Запись другого процесса меняет версию в той же транзакции.
+        ResourceVersion.bump('genres')
+        assert lookups.genres.slugs()['drama'].name == 'Мелодрама'
+
+    def test_04_unknown_id_reloads(self, user_client):
+        lookups.genres.slugs()
+        title = Title.objects.create(
+            name='Титаник', year=1997,
+            category=Category.objects.get(slug='film'),
+        )
+        # bulk_create не вызывает сигналы, версия не меняется.
+        Genre.objects.bulk_create([Genre(name='Комедия', slug='comedy')])
+        title.genre.add(Genre.objects.get(slug='comedy'))
+        response = user_client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['results'][0]['genre'] == [
+            {'slug': 'comedy', 'name': 'Комедия'}
+        ]
+
+    def test_05_unknown_slug_reloads(self, admin_client):
+        lookups.genres.slugs()
+        # Запись в обход сигналов: версия жанров не меняется.
+        Genre.objects.bulk_create([Genre(name='Комедия', slug='comedy')])
+        response = admin_client.post(self.TITLES_URL, data={
+            'name': 'Маска', 'year': 1994,
+            'category': 'film', 'genre': ['comedy'],
+        })
+        assert response.status_code == HTTPStatus.CREATED
+
+    def test_06_versions_restart(self):
+        ResourceVersion.objects.all().delete()
+        ResourceVersion.bump('genres')
+        assert lookups.genres.slugs()['drama'].name == 'Драма'
+        # Как после очистки базы: номер версии тот же, время другое.
+        ResourceVersion.objects.all().delete()
+        Genre.objects.filter(slug='drama').update(name='Мелодрама')
+        ResourceVersion.bump('genres')
+        assert lookups.genres.slugs()['drama'].name == 'Мелодрама'
@@ -0,0 +1,75 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29TitleFilters:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def titles(self, category, genre):
+        film, drama = category, genre
+        book = Category.objects.create(name='Книга', slug='book')
+        melodrama = Genre.objects.create(name='Мелодрама', slug='melodrama')
+        action = Genre.objects.create(name='Боевик', slug='action')
+        titles = {}
+        for name, category, genres in (
+            ('Титаник', film, (drama, melodrama)),
+            ('Терминатор', film, (action, drama)),
+            ('Анна Каренина', book, (melodrama,)),
+            ('Без жанра', book, ()),
+        ):
+            title = Title.objects.create(
+                name=name, year=2000, category=category
+            )
+            title.genre.set(genres)
+            titles[name] = title
+        return titles
+
+    def names(self, client, params):
+        response = client.get(self.TITLES_URL, params)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        return sorted(result['name'] for result in results)
+
+    @pytest.mark.parametrize('params, expected', (
+        ({'genre': 'drama'}, ['Терминатор', 'Титаник']),
+        ({'genre': 'drama,melodrama'},
+         ['Анна Каренина', 'Терминатор', 'Титаник']),
+        ({'genre': 'dram'}, []),
+        ({'genre': ''}, ['Анна Каренина', 'Без жанра', 'Терминатор',
+                         'Титаник']),
+        ({'category': 'film'}, ['Терминатор', 'Титаник']),
+        ({'category': 'film,book'},
+         ['Анна Каренина', 'Без жанра', 'Терминатор', 'Титаник']),
+        ({'category': 'fil'}, []),
+        ({'category': 'book', 'genre': 'melodrama'}, ['Анна Каренина']),
+        ({'genre__icontains': 'dram'},
+         ['Анна Каренина', 'Терминатор', 'Титаник']),
+        ({'category__icontains': 'OO'}, ['Анна Каренина', 'Без жанра']),
+    ))
+    def test_01_filters(self, user_client, titles, params, expected):
+        assert self.names(user_client, params) == expected
+
+    def test_02_genre_subquery(self, user_client, titles):
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(
+                self.TITLES_URL, {'genre': 'drama,melodrama,action'}
+            )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()['count'] == 3
+        page_queries = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert page_queries
+        for sql in page_queries:
+            assert 'JOIN "reviews_title_genre"' not in sql
+            assert 'DISTINCT' not in sql